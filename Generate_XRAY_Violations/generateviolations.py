@@ -1,10 +1,31 @@
 import argparse
+import csv
+import fnmatch
+import heapq
+import hashlib
 import json
+import os
+import sqlite3
 import sys
-import requests
-from datetime import datetime
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from itertools import islice
 from tabulate import tabulate
 
+# The shared JFrog REST client lives at the root of the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from jfrog_client import IDEMPOTENT_METHODS, JFrogClient, profiling  # noqa: E402
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    # Optional: --summary falls back to parsing each page in full
+    ijson = None
+
 
 def usage():
     print("Usage: generateviolations.py [OPTIONS]")
@@ -14,7 +35,9 @@ def usage():
         "  --jfrog_url <url>                JFrog Xray URL (e.g., https://xray.example.com)"
     )
     print("  --jfrog_token <bearer_token>           Bearer token for authentication")
-    print("  --watch_name <watch_name>        Name of the watch")
+    print(
+        "  --watch_name <watch_name> [...]  Name(s) of the watch; glob patterns such as 'prod-*' are expanded"
+    )
     print("  --violation_type <type>          Type of violation (e.g., Security)")
     print("  --min_severity <severity>        Minimum severity (e.g., High)")
     print(
@@ -30,6 +53,73 @@ def usage():
     print("  --direction <asc|desc>           Order direction")
     print("  --limit <number>                 Number of results to return")
     print("  --offset <number>                Offset for pagination")
+    print(
+        "  --incremental                    Only fetch violations created since the last run"
+    )
+    print(
+        "  --state_file <path>              Incremental state file (default: violations_state.json)"
+    )
+    print("  --workers <number>               Concurrent Xray requests (default: 8)")
+    print(
+        "  --diff_previous                  Report new/resolved violations against the previous bundle version"
+    )
+    print(
+        "  --summary                        Keep only the summary table fields of each violation"
+    )
+    print(
+        "  --shard_days <days>              Query the date range as parallel windows of this many days"
+    )
+    print(
+        "  --shard_threshold <number>       Split windows holding more violations than this (default: 10000)"
+    )
+    print(
+        "  --table_format <format>          grid (default), csv, tsv or ndjson"
+    )
+    print(
+        "  --table_file <path>              Write csv/tsv/ndjson rows to a file instead of stdout"
+    )
+    print(
+        "  --top_n <number>                 Maximum grid rows per bundle, most severe first (default: 50)"
+    )
+    print(
+        "  --max_field_width <number>       Maximum grid cell width (default: 60)"
+    )
+    print(
+        "  --cache_dir <path>               Cache watch and bundle metadata between runs"
+    )
+    print(
+        "  --cache_ttl <seconds>            Validity of cached responses without ETag (default: 3600)"
+    )
+    print("  --pretty                         Indent JSON output files and request bodies")
+    print(
+        "  --no_json                        Do not write <bundle_name>_violations.json files"
+    )
+    print(
+        "  --aggregate                      Write one consolidated report across all bundles"
+    )
+    print(
+        "  --export_columnar <path>         Write a flattened Parquet/Arrow export (requires pyarrow)"
+    )
+    print(
+        "  --columnar_format <format>       parquet (default) or arrow"
+    )
+    print("  --sqlite_db <path>               Ingest violations into a local SQLite store")
+    print(
+        "  --report <name>                  Report from the store (top_components, new_criticals, severity_by_bundle)"
+    )
+    print(
+        "  --report_since <timestamp>       Only report violations created since (default: 24 hours ago)"
+    )
+    print("  --report_top <number>            Maximum rows in the report (default: 20)")
+    print(
+        "  --report_only                    Generate --report without querying Xray"
+    )
+    print(
+        "  --profile                        Print per-endpoint latencies and network vs local time at exit"
+    )
+    print(
+        "  --profile_json <path>            Also write the run profile to a JSON file"
+    )
     print("")
     print("Example:")
     print(
@@ -71,223 +161,1901 @@ def validateSeverity(severity):
         return False
 
 
-def get_release_bundles_from_watch(jfrog_url, jfrog_token, watch_name):
+# Endpoints with a name in their path, labelled by template in the latency statistics
+XRAY_ENDPOINTS = [
+    "xray/api/v2/watches/{name}",
+    "lifecycle/api/v2/release_bundle/records/{name}",
+]
+
+
+def create_session(jfrog_token, pool_size=10, jfrog_url=None):
     """
-    Calls the JFrog Xray API to get release bundles for a given watch.
+    Creates the JFrog REST client shared by every request of the run.
 
     Args:
-        jfrog_url (str): Base URL of JFrog Xray.
         jfrog_token (str): Bearer token for authentication.
+        pool_size (int): Number of pooled connections per host.
+        jfrog_url (str): Base URL of the JFrog Platform.
+
+    Returns:
+        JFrogClient: Pooled client with the auth headers set. Violation
+            searches are POSTs without side effects, so they are retried too.
+    """
+    return JFrogClient(
+        jfrog_url,
+        token=jfrog_token,
+        pool_size=pool_size,
+        retry_methods=IDEMPOTENT_METHODS | {"POST"},
+        endpoints=XRAY_ENDPOINTS,
+    )
+
+
+class ResponseCache:
+    """
+    On-disk cache for GET endpoints whose responses rarely change (watches, bundle catalog).
+
+    Entries keep the body with its ETag/Last-Modified validators. Entries with
+    validators are revalidated with a conditional request on every use; entries
+    without them are served until they are older than ttl seconds.
+    """
+
+    def __init__(self, cache_dir, ttl):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def entry_path(self, url, params):
+        key = f"{url}?{json.dumps(params or {}, sort_keys=True)}"
+        return os.path.join(
+            self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".json"
+        )
+
+    def get_json(self, session, path, params=None, path_params=None):
+        """
+        Returns the JSON body of a GET request, from the cache when it is still valid.
+
+        Args:
+            session (JFrogClient): Shared client.
+            path (str): Path or endpoint template, relative to the JFrog URL.
+            params (dict): Query parameters.
+            path_params (dict): Values of the template fields of path.
+        """
+        url, _ = session.resolve(path, path_params)
+        cache_path = self.entry_path(url, params)
+        entry = None
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                entry = None
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            if not headers and time.time() - entry.get("fetched_at", 0) < self.ttl:
+                return entry["body"]
+
+        response = session.get(
+            path, path_params=path_params, headers=headers, params=params
+        )
+        if entry and response.status_code == 304:
+            entry["fetched_at"] = time.time()
+        else:
+            response.raise_for_status()
+            entry = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "body": response.json(),
+            }
+        tmp_file = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_file, cache_path)
+        return entry["body"]
+
+
+def get_json(session, path, params=None, path_params=None, cache=None):
+    """
+    Performs a GET request and returns the JSON body, through the response cache when given.
+    """
+    if cache is not None:
+        return cache.get_json(session, path, params, path_params)
+    return session.get_json(path, path_params=path_params, params=params)
+
+
+def get_watch_names(session, cache=None):
+    """
+    Calls the JFrog Xray API to list the names of all watches.
+
+    Returns:
+        list: Watch names.
+    """
+    try:
+        watches = get_json(session, "xray/api/v2/watches", cache=cache)
+        return [watch.get("general_data", {}).get("name", "") for watch in watches]
+    except Exception as e:
+        print(f"Failed to fetch the list of watches: {e}")
+        return []
+
+
+def resolve_watch_names(session, patterns, cache=None):
+    """
+    Expands --watch_name values into watch names; glob patterns are matched against all watches.
+
+    Args:
+        session (JFrogClient): Shared client.
+        patterns (list): Watch names or glob patterns (e.g., "prod-*").
+        cache (ResponseCache): Optional response cache.
+
+    Returns:
+        list: Unique watch names, in the order given.
+    """
+    all_watches = None
+    watch_names = []
+    for pattern in patterns:
+        if any(c in pattern for c in "*?["):
+            if all_watches is None:
+                all_watches = get_watch_names(session, cache)
+            matches = fnmatch.filter(all_watches, pattern)
+            if not matches:
+                print(f"No watches match '{pattern}'")
+        else:
+            matches = [pattern]
+        for name in matches:
+            if name not in watch_names:
+                watch_names.append(name)
+    return watch_names
+
+
+def get_release_bundles_from_watch(session, watch_name, cache=None):
+    """
+    Calls the JFrog Xray API to get release bundles for a given watch.
+
+    Args:
+        session (JFrogClient): Shared client.
         watch_name (str): Name of the watch.
+        cache (ResponseCache): Optional response cache.
 
     Returns:
         list: List of release bundles under project_resources -> resources.
     """
-    url = f"{jfrog_url}/xray/api/v2/watches/{watch_name}"
-    headers = {
-        "Authorization": f"Bearer {jfrog_token}",
-        "Content-Type": "application/json",
-    }
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json(
+            session,
+            "xray/api/v2/watches/{name}",
+            path_params={"name": watch_name},
+            cache=cache,
+        )
         resources = data.get("project_resources", {}).get("resources", [])
         return resources
     except Exception as e:
-        print(f"Failed to fetch release bundles from watch: {e}")
+        print(f"Failed to fetch release bundles from watch {watch_name}: {e}")
         return []
 
 
-def get_all_release_bundles(jfrog_url, jfrog_token):
-    url = f"{jfrog_url}/lifecycle/api/v2/release_bundle/groups"
-    headers = {
-        "Authorization": f"Bearer {jfrog_token}",
-        "Content-Type": "application/json",
-    }
+def get_all_release_bundles(session, cache=None):
+    """
+    Lists the release bundle catalog, page by page, through the response cache when given.
+
+    Returns:
+        list: Release bundles read before the first error, if any.
+    """
     release_bundles = []
-    limit = 10
-    offset = 0
+    try:
+        for bundle in session.paginate_offset(
+            "lifecycle/api/v2/release_bundle/groups",
+            "release_bundles",
+            limit=10,
+            get_json=lambda path, params: get_json(session, path, params, cache=cache),
+        ):
+            release_bundles.append(bundle)
+    except Exception as e:
+        print(f"Failed to fetch release bundles: {e}")
+    return release_bundles
 
-    while True:
-        params = {"limit": limit, "offset": offset}
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-            bundles = data.get("release_bundles", [])
-            release_bundles.extend(bundles)
-            total = data.get("total", 0)
-            offset += limit
-            if offset >= total or not bundles:
-                break
-        except Exception as e:
-            print(f"Failed to fetch release bundles: {e}")
-            break
 
-    return release_bundles
+def get_release_bundle_versions(session, bundle_name, project=None):
+    """
+    Calls the Lifecycle API to list the versions of a release bundle, newest first.
+
+    Args:
+        session (JFrogClient): Shared client.
+        bundle_name (str): Release bundle name.
+        project (str): Project key of the release bundle.
+
+    Returns:
+        list: Version strings ordered by creation time, newest first.
+    """
+    params = {"order_by": "created", "order_asc": "false", "limit": 10}
+    if project:
+        params["project"] = project
+    try:
+        data = get_json(
+            session,
+            "lifecycle/api/v2/release_bundle/records/{name}",
+            params,
+            path_params={"name": bundle_name},
+        )
+        records = sorted(
+            data.get("release_bundles", []),
+            key=lambda r: r.get("created") or "",
+            reverse=True,
+        )
+        return [r.get("release_bundle_version") for r in records]
+    except Exception as e:
+        print(f"Failed to fetch versions of release bundle {bundle_name}: {e}")
+        return []
 
 
-def get_bundle_details(jfrog_url, jfrog_token, bundle_name, release_bundles):
+def index_release_bundles(release_bundles):
+    """
+    Indexes the release bundle catalog by name, keeping the first entry that has a latest version.
+
+    Args:
+        release_bundles (list): Output of get_all_release_bundles.
+
+    Returns:
+        dict: Bundle details keyed by release bundle name.
+    """
+    bundles_by_name = {}
     for bundle in release_bundles:
-        if (
-            bundle.get("release_bundle_name") == bundle_name
-            and "release_bundle_version_latest" in bundle
-        ):
-            return bundle
+        if "release_bundle_version_latest" in bundle:
+            bundles_by_name.setdefault(bundle.get("release_bundle_name"), bundle)
+    return bundles_by_name
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Generate violations from JFrog Xray")
-    parser.add_argument(
-        "--jfrog_url",
-        help="JFrog Xray URL (e.g., https://xray.example.com)",
-        required=True,
-    )
-    parser.add_argument(
-        "--jfrog_token", required=True, help="Bearer token for authentication"
-    )
-    parser.add_argument("--watch_name", required=True, help="Name of the watch")
-    parser.add_argument(
-        "--violation_type", required=True, help="Type of violation (e.g., Security)"
-    )
-    parser.add_argument(
-        "--min_severity", required=True, help="Minimum severity (e.g., High)"
-    )
-    parser.add_argument(
-        "--created_from",
-        required=True,
-        help="Start date/time (e.g., 2025-06-16T18:22:04+00:00)",
-    )
-    parser.add_argument(
-        "--created_until",
-        required=True,
-        help="End date/time (e.g., 2025-07-17T18:22:04+00:00)",
-    )
-    parser.add_argument("--order_by", default="created")
-    parser.add_argument("--direction", default="asc")
-    parser.add_argument("--limit", type=int, default=100)
-    parser.add_argument("--offset", type=int, default=1)
-    args = parser.parse_args()
+def parse_created(created):
+    """
+    Parses an Xray "created" timestamp into an aware datetime.
 
-    # Validate created_from and created_until dates
-    if not validatecreateddate(args.created_from):
-        print(
-            "Error: Invalid format for --created_from. Expected format: YYYY-MM-DDTHH:MM:SS+ZZZZ"
-        )
-        sys.exit(1)
-    if not validatecreateddate(args.created_until):
-        print(
-            "Error: Invalid format for --created_until. Expected format: YYYY-MM-DDTHH:MM:SS+ZZZZ"
-        )
-        sys.exit(1)
+    Args:
+        created (str): Timestamp such as 2025-06-16T18:22:04Z or 2025-06-16T18:22:04.123+00:00.
 
-    # Validate severity
-    if not validateSeverity(args.min_severity):
-        print("Error: Invalid severity level provided.")
-        sys.exit(1)
+    Returns:
+        datetime: Parsed timestamp (UTC when no offset is given), or None if it cannot be parsed.
+    """
+    if not created:
+        return None
+    try:
+        value = datetime.fromisoformat(created.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            value = datetime.strptime(created, "%Y-%m-%dT%H:%M:%S%z")
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
 
-    # Get release bundles from the watch
-    release_bundles_from_watch = get_release_bundles_from_watch(
-        args.jfrog_url, args.jfrog_token, args.watch_name
-    )
 
-    # Get all release bundles to find the latest version for each bundle name
-    all_bundles = get_all_release_bundles(args.jfrog_url, args.jfrog_token)
+def violation_keys(violation):
+    """
+    Returns the de-duplication keys of a violation, one per impacted artifact.
 
-    # Update each bundle in release_bundles_from_watch to use the latest version
-    for bundle in release_bundles_from_watch:
-        name = bundle.get("name", "")
-        bundle_details = get_bundle_details(
-            args.jfrog_url, args.jfrog_token, name, all_bundles
-        )
-        if bundle_details:
-            latest_version = bundle_details.get("release_bundle_version_latest", "")
-            project_key = bundle_details.get("project_key", "")
-            bundle["version"] = latest_version
-            bundle["project"] = project_key
-
-    # Loop through each release bundle and generate violations, storing in separate JSON files
-    for bundle in release_bundles_from_watch:
-        bundle_name = bundle.get("name", "")
-        bundle_version = bundle.get("version", "")
-        bundle_project = bundle.get("project", "")
-        # Frame the request body for this bundle
-        body = {
-            "filters": {
-                "watch_name": args.watch_name,
-                "violation_type": args.violation_type,
-                "min_severity": args.min_severity,
-                "created_from": args.created_from,
-                "created_until": args.created_until,
-                "resources": {
-                    "release_bundles_v2": [
-                        {
-                            "name": bundle_name,
-                            "version": bundle_version,
-                            "project": bundle_project,
-                        }
-                    ]
-                },
-            },
-            "pagination": {
-                "order_by": args.order_by,
-                "direction": args.direction,
-                "limit": args.limit,
-                "offset": args.offset,
-            },
-        }
+    Args:
+        violation (dict): Violation object returned by Xray.
 
-        url = f"{args.jfrog_url}/xray/api/v1/violations"
-        headers = {
-            "Authorization": f"Bearer {args.jfrog_token}",
-            "Content-Type": "application/json",
-        }
+    Returns:
+        list: List of "issue_id|artifact" strings.
+    """
+    issue_id = violation.get("issue_id", "")
+    artifacts = violation.get("impacted_artifacts") or [""]
+    return [f"{issue_id}|{artifact}" for artifact in artifacts]
 
-        print(
-            f"Requesting violations for bundle '{bundle_name}' from {url} with filters: {json.dumps(body, indent=2)}"
+
+def load_state(state_file):
+    """
+    Loads the incremental sync state file.
+
+    Args:
+        state_file (str): Path to the state file.
+
+    Returns:
+        dict: State keyed by watch name, then bundle name.
+    """
+    if not os.path.exists(state_file):
+        return {}
+    try:
+        with open(state_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Failed to read state file {state_file}, starting a full sync: {e}")
+        return {}
+
+
+def save_state(state_file, state):
+    """
+    Writes the incremental sync state file atomically.
+
+    Args:
+        state_file (str): Path to the state file.
+        state (dict): State keyed by watch name, then bundle name.
+    """
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, state_file)
+
+
+def get_incremental_created_from(created_from, bundle_state):
+    """
+    Returns the start of the query window for an incremental run.
+
+    The high-water mark is inclusive, so violations created in the same second
+    as the last seen one are fetched again and dropped by select_new_violations.
+
+    Args:
+        created_from (str): The --created_from argument.
+        bundle_state (dict): State of the bundle from the previous run.
+
+    Returns:
+        str: The later of created_from and the stored high-water mark.
+    """
+    last_created = parse_created(bundle_state.get("last_created"))
+    if last_created and last_created > parse_created(created_from):
+        return last_created.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+    return created_from
+
+
+# Violation fields kept by --summary, the ones shown in the summary table
+SUMMARY_KEYS = [
+    "severity",
+    "type",
+    "infected_components",
+    "created",
+    "watch_name",
+    "issue_id",
+    "impacted_artifacts",
+]
+
+
+def stream_summary_violations(events):
+    """
+    Parses a violations response incrementally, building only the SUMMARY_KEYS of each violation.
+
+    Other fields are skipped by the parser and never materialized.
+
+    Args:
+        events: ijson (prefix, event, value) events of the response body.
+
+    Returns:
+        dict: {"total_violations": int, "violations": [compact violation, ...]}
+    """
+    data = {"total_violations": 0, "violations": []}
+    builder = None
+    keep = False
+    for prefix, event, value in events:
+        if prefix == "total_violations":
+            data["total_violations"] = value
+        elif prefix == "violations.item":
+            if event == "start_map":
+                builder = ObjectBuilder()
+                builder.event(event, value)
+            elif event == "end_map":
+                builder.event(event, value)
+                data["violations"].append(builder.value)
+                builder = None
+            elif event == "map_key":
+                keep = value in SUMMARY_KEYS
+                if keep:
+                    builder.event(event, value)
+        elif builder is not None and keep:
+            builder.event(event, value)
+    return data
+
+
+def summarize_violations(data):
+    """Keeps only the SUMMARY_KEYS of each violation of a parsed response."""
+    if isinstance(data, dict):
+        data["violations"] = [
+            {k: v[k] for k in SUMMARY_KEYS if k in v}
+            for v in data.get("violations") or []
+        ]
+    return data
+
+
+def post_violations(session, url, body, summary=False):
+    """
+    Posts a violations query and returns the parsed response; raises
+    requests.HTTPError on error statuses.
+
+    Args:
+        session (JFrogClient): Shared client.
+        url (str): Violations API URL.
+        body (dict): Request body.
+        summary (bool): Keep only SUMMARY_KEYS of each violation, parsing the
+            body as a stream when ijson is installed.
+
+    Returns:
+        dict: The parsed response.
+    """
+    if summary and ijson is not None:
+        return stream_summary_violations(
+            session.iter_json_events("POST", url, json=body)
         )
-        response = requests.post(url, headers=headers, data=json.dumps(body))
-        output_file = f"{bundle_name}_violations.json"
-        with open(output_file, "w") as f:
-            try:
-                json_response = response.json()
-                json.dump(json_response, f, indent=2)
-            except ValueError:
-                f.write(response.text)
+    response = session.post(url, json=body)
+    response.raise_for_status()
+    data = response.json()
+    return summarize_violations(data) if summary else data
 
-        print(f"Output stored in {output_file}")
 
-        # Extract and display keys in table format
-        try:
-            with open(output_file, "r") as f:
-                data = json.load(f)
-            if (
-                "violations" in data
-                and isinstance(data["violations"], list)
-                and data["violations"]
-            ):
-                all_keys = [
-                    "severity",
-                    "type",
-                    "infected_components",
-                    "created",
-                    "watch_name",
-                    "issue_id",
-                    "impacted_artifacts",
-                ]
-                rows = []
-                for v in data["violations"]:
-                    row = [str(v.get(k, "")) for k in all_keys]
-                    rows.append(row)
-                print(f"\nViolation Keys Table for bundle '{bundle_name}':")
-                print(tabulate(rows, headers=all_keys, tablefmt="grid"))
-            else:
-                print(f"No violations found in response for bundle '{bundle_name}'.")
-        except Exception as e:
-            print(
-                f"Failed to extract/display violation keys for bundle '{bundle_name}': {e}"
-            )
+def iter_violation_pages(session, url, body, summary=False):
+    """
+    Walks every page of a violations query.
+
+    Args:
+        session (JFrogClient): Shared client.
+        url (str): Violations API URL.
+        body (dict): Request body; pagination.offset is the first page to fetch.
+        summary (bool): Keep only SUMMARY_KEYS of each violation.
+
+    Yields:
+        list: The violations of each page.
+    """
+    body = json.loads(json.dumps(body))
+    pagination = body["pagination"]
+    fetched = 0
+    while True:
+        data = post_violations(session, url, body, summary)
+        page = data.get("violations") or []
+        if page:
+            yield page
+        fetched += len(page)
+        if not page or fetched >= data.get("total_violations", 0):
+            break
+        pagination["offset"] += 1
+
+
+def select_new_violations(bundle_state, violations):
+    """
+    Drops the violations an earlier run already stored.
+
+    The query window starts at the second of the high-water mark, so the
+    violations created in that second up to the mark are fetched again; they
+    are recognized by the keys kept in last_ids. Duplicates within the batch
+    (e.g. on page boundaries) are dropped too.
+
+    Args:
+        bundle_state (dict): State of the bundle from the previous run.
+        violations (list): Newly fetched violations.
+
+    Returns:
+        list: Violations that were not already in the store.
+    """
+    last_created = parse_created(bundle_state.get("last_created"))
+    last_ids = set(bundle_state.get("last_ids", []))
+    seen = set()
+    new_violations = []
+    for v in violations:
+        keys = violation_keys(v)
+        created = parse_created(v.get("created"))
+        if (
+            last_created
+            and created
+            and created <= last_created
+            and all(key in last_ids for key in keys)
+        ):
+            continue
+        if all(key in seen for key in keys):
+            continue
+        seen.update(keys)
+        new_violations.append(v)
+    return new_violations
+
+
+def append_violations(store_file, violations, bundle_state):
+    """
+    Appends violations to a cumulative NDJSON store, one violation per line,
+    so a run only writes its delta.
+
+    The store size after the last recorded append is kept in the bundle
+    state; lines a crashed run appended without saving its state are cut off
+    first, since that run's violations are fetched again.
+
+    Args:
+        store_file (str): Path to the cumulative store NDJSON file.
+        violations (list): Violations to append.
+        bundle_state (dict): State of the bundle, updated in place.
+    """
+    with open(store_file, "ab") as f:
+        if "store_bytes" in bundle_state and f.tell() > bundle_state["store_bytes"]:
+            f.truncate(bundle_state["store_bytes"])
+            f.seek(0, os.SEEK_END)
+        for v in violations:
+            f.write(json.dumps(v, separators=(",", ":")).encode() + b"\n")
+        bundle_state["store_bytes"] = f.tell()
+
+
+def convert_legacy_store(legacy_file, store_file, bundle_state):
+    """
+    Converts a <bundle_name>_violations_store.json store of earlier versions
+    to the NDJSON store, once.
+    """
+    if not os.path.exists(legacy_file) or os.path.exists(store_file):
+        return
+    with open(legacy_file, "r") as f:
+        stored = json.load(f).get("violations", [])
+    bundle_state.pop("store_bytes", None)
+    append_violations(store_file, stored, bundle_state)
+    os.remove(legacy_file)
+    print(f"Converted {legacy_file} to {store_file}")
+
+
+def update_bundle_state(bundle_state, violations):
+    """
+    Advances the high-water mark of a bundle with newly fetched violations.
+
+    last_ids holds the keys of the violations created in the second of the
+    mark, the ones the next run fetches again.
+
+    Args:
+        bundle_state (dict): State of the bundle, updated in place.
+        violations (list): Newly fetched violations.
+    """
+    previous = parse_created(bundle_state.get("last_created"))
+    last_created = previous
+    for v in violations:
+        created = parse_created(v.get("created"))
+        if created is not None and (last_created is None or created > last_created):
+            last_created = created
+    if not last_created:
+        return
+    window_start = last_created.replace(microsecond=0)
+    last_ids = set()
+    if previous and previous >= window_start:
+        last_ids.update(bundle_state.get("last_ids", []))
+    for v in violations:
+        created = parse_created(v.get("created"))
+        if created is not None and window_start <= created <= last_created:
+            last_ids.update(violation_keys(v))
+    bundle_state["last_created"] = last_created.isoformat()
+    bundle_state["last_ids"] = sorted(last_ids)
+
+
+VIOLATION_ROW_COLUMNS = [
+    "watch_name",
+    "bundle_name",
+    "bundle_version",
+    "issue_id",
+    "component",
+    "artifact",
+    "severity",
+    "type",
+    "created",
+    "description",
+    "details_url",
+]
+
+VIOLATIONS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS violations (
+    watch_name TEXT NOT NULL,
+    bundle_name TEXT NOT NULL,
+    bundle_version TEXT NOT NULL,
+    issue_id TEXT NOT NULL,
+    component TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    severity TEXT,
+    type TEXT,
+    created TEXT,
+    description TEXT,
+    details_url TEXT,
+    ingested TEXT,
+    PRIMARY KEY (watch_name, bundle_name, bundle_version, issue_id, component, artifact)
+);
+CREATE INDEX IF NOT EXISTS idx_violations_severity ON violations (severity);
+CREATE INDEX IF NOT EXISTS idx_violations_watch ON violations (watch_name);
+CREATE INDEX IF NOT EXISTS idx_violations_bundle ON violations (bundle_name);
+CREATE INDEX IF NOT EXISTS idx_violations_issue ON violations (issue_id);
+CREATE INDEX IF NOT EXISTS idx_violations_component ON violations (component);
+CREATE INDEX IF NOT EXISTS idx_violations_created ON violations (created);
+"""
+
+# Reports available through --report. Each query takes :since and :top parameters.
+REPORT_QUERIES = {
+    "top_components": (
+        ["Component", "Violations", "Issues", "Bundles", "Critical", "High"],
+        """
+        SELECT component,
+               COUNT(*),
+               COUNT(DISTINCT issue_id),
+               COUNT(DISTINCT bundle_name),
+               SUM(severity = 'Critical'),
+               SUM(severity = 'High')
+        FROM violations
+        WHERE created >= :since
+        GROUP BY component
+        ORDER BY COUNT(DISTINCT bundle_name) DESC, COUNT(*) DESC
+        LIMIT :top
+        """,
+    ),
+    "new_criticals": (
+        ["Created", "Issue ID", "Component", "Watch", "Bundle", "Version", "Artifact"],
+        """
+        SELECT created, issue_id, component, watch_name, bundle_name, bundle_version, artifact
+        FROM violations
+        WHERE severity = 'Critical' AND created >= :since
+        ORDER BY created DESC
+        LIMIT :top
+        """,
+    ),
+    "severity_by_bundle": (
+        ["Watch", "Bundle", "Critical", "High", "Medium", "Low", "Total"],
+        """
+        SELECT watch_name,
+               bundle_name,
+               SUM(severity = 'Critical'),
+               SUM(severity = 'High'),
+               SUM(severity = 'Medium'),
+               SUM(severity = 'Low'),
+               COUNT(*)
+        FROM violations
+        WHERE created >= :since
+        GROUP BY watch_name, bundle_name
+        ORDER BY SUM(severity = 'Critical') DESC, COUNT(*) DESC
+        LIMIT :top
+        """,
+    ),
+}
+
+
+def open_violation_db(db_path):
+    """
+    Opens (and creates if needed) the local SQLite violation store.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+
+    Returns:
+        sqlite3.Connection: Open connection with the schema and indexes in place.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(VIOLATIONS_SCHEMA)
+    return conn
+
+
+def flatten_violations(watch_name, bundle_name, bundle_version, violations):
+    """
+    Flattens violations into one row per violation x infected component x impacted artifact.
+
+    Args:
+        watch_name (str): Name of the watch.
+        bundle_name (str): Release bundle name.
+        bundle_version (str): Release bundle version.
+        violations (list): Violations returned by Xray.
+
+    Yields:
+        tuple: Row values in VIOLATION_ROW_COLUMNS order; created is an aware datetime or None.
+    """
+    for v in violations:
+        created = parse_created(v.get("created"))
+        if created:
+            created = created.astimezone(timezone.utc)
+        for component in v.get("infected_components") or [""]:
+            for artifact in v.get("impacted_artifacts") or [""]:
+                yield (
+                    v.get("watch_name") or watch_name,
+                    bundle_name,
+                    bundle_version,
+                    v.get("issue_id", ""),
+                    component,
+                    artifact,
+                    v.get("severity"),
+                    v.get("type"),
+                    created,
+                    v.get("description"),
+                    v.get("violation_details_url"),
+                )
+
+
+def ingest_violations(
+    conn, watch_name, bundle_name, bundle_version, violations, batch_size=5000
+):
+    """
+    Ingests violations into the SQLite store using batched inserts in one transaction.
+
+    Args:
+        conn (sqlite3.Connection): Open violation store.
+        watch_name (str): Name of the watch.
+        bundle_name (str): Release bundle name.
+        bundle_version (str): Release bundle version.
+        violations (list): Violations returned by Xray.
+        batch_size (int): Number of rows per executemany call.
+
+    Returns:
+        int: Number of rows written.
+    """
+    ingested = datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    rows = (
+        row[:8] + (row[8].isoformat() if row[8] else "",) + row[9:] + (ingested,)
+        for row in flatten_violations(
+            watch_name, bundle_name, bundle_version, violations
+        )
+    )
+    count = 0
+    with conn:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            conn.executemany(
+                "INSERT OR REPLACE INTO violations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+            count += len(batch)
+    return count
+
+
+def run_report(conn, report, since, top):
+    """
+    Prints a report generated from the SQLite store.
+
+    Args:
+        conn (sqlite3.Connection): Open violation store.
+        report (str): Name of the report in REPORT_QUERIES.
+        since (str): Only include violations created at or after this timestamp.
+        top (int): Maximum number of rows.
+    """
+    headers, query = REPORT_QUERIES[report]
+    since_value = parse_created(since)
+    since = since_value.astimezone(timezone.utc).isoformat() if since_value else ""
+    rows = conn.execute(query, {"since": since, "top": top}).fetchall()
+    print(f"\nReport '{report}' (created since {since or 'the beginning'}):")
+    if rows:
+        print(tabulate(rows, headers=headers, tablefmt="grid", disable_numparse=True))
+    else:
+        print("No matching violations in the store.")
+
+
+class ColumnarExporter:
+    """
+    Writes flattened violation rows to a Parquet or Arrow IPC file, one record batch per page.
+
+    Pages are written from the worker threads as they arrive, under a lock.
+    pyarrow is only imported when an export is requested.
+    """
+
+    def __init__(self, path, file_format="parquet"):
+        try:
+            import pyarrow
+        except ImportError:
+            print(
+                "Error: --export_columnar requires pyarrow. Install it with: pip install pyarrow"
+            )
+            sys.exit(1)
+
+        self.pa = pyarrow
+        self.path = path
+        self.file_format = file_format
+        self.rows = 0
+        self.lock = threading.Lock()
+        self.schema = pyarrow.schema(
+            [
+                (
+                    column,
+                    (
+                        pyarrow.timestamp("us", tz="UTC")
+                        if column == "created"
+                        else pyarrow.string()
+                    ),
+                )
+                for column in VIOLATION_ROW_COLUMNS
+            ]
+        )
+        if file_format == "parquet":
+            import pyarrow.parquet
+
+            self.writer = pyarrow.parquet.ParquetWriter(
+                path, self.schema, compression="zstd"
+            )
+        else:
+            import pyarrow.ipc
+
+            self.sink = pyarrow.OSFile(path, "wb")
+            self.writer = pyarrow.ipc.new_file(self.sink, self.schema)
+
+    def write_page(self, watch_name, bundle_name, bundle_version, violations):
+        """Appends one page of violations as a record batch."""
+        rows = list(
+            flatten_violations(watch_name, bundle_name, bundle_version, violations)
+        )
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        batch = self.pa.RecordBatch.from_arrays(
+            [
+                self.pa.array(values, type=self.schema.field(i).type)
+                for i, values in enumerate(columns)
+            ],
+            schema=self.schema,
+        )
+        with self.lock:
+            self.writer.write_batch(batch)
+            self.rows += len(rows)
+
+    def close(self):
+        self.writer.close()
+        if self.file_format != "parquet":
+            self.sink.close()
+        print(f"Columnar export: {self.rows} rows written to {self.path}")
+
+
+SEVERITY_RANK = {"Unknown": 0, "Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+
+
+class ViolationAggregator:
+    """
+    Merges violations from all bundles of a watch into one entry per issue_id + component.
+
+    Violations are added bundle by bundle (or page by page) and grouped in a
+    dict, so the consolidated report is built in a single pass.
+    """
+
+    def __init__(self, watch_name):
+        self.watch_name = watch_name
+        self.entries = {}
+        self.total = 0
+
+    def add(self, bundle_name, bundle_version, violations):
+        """Adds the violations of one bundle (or one page of it)."""
+        bundle = f"{bundle_name}/{bundle_version}" if bundle_version else bundle_name
+        for v in violations:
+            self.total += 1
+            severity = v.get("severity") or "Unknown"
+            # "created" may be null, which does not compare with strings
+            created = v.get("created") or ""
+            for component in v.get("infected_components") or [""]:
+                key = (v.get("issue_id", ""), component)
+                entry = self.entries.get(key)
+                if entry is None:
+                    entry = self.entries[key] = {
+                        "issue_id": key[0],
+                        "component": component,
+                        "type": v.get("type"),
+                        "severity": severity,
+                        "severity_counts": {},
+                        "first_created": created,
+                        "last_created": created,
+                        "bundles": set(),
+                        "artifacts": set(),
+                    }
+                if SEVERITY_RANK.get(severity, 0) > SEVERITY_RANK.get(
+                    entry["severity"], 0
+                ):
+                    entry["severity"] = severity
+                counts = entry["severity_counts"]
+                counts[severity] = counts.get(severity, 0) + 1
+                if created and (
+                    not entry["first_created"] or created < entry["first_created"]
+                ):
+                    entry["first_created"] = created
+                if created > entry["last_created"]:
+                    entry["last_created"] = created
+                entry["bundles"].add(bundle)
+                entry["artifacts"].update(v.get("impacted_artifacts") or [])
+
+    def report(self):
+        """
+        Returns the consolidated report, most severe and most widespread issues first.
+        """
+        issues = sorted(
+            self.entries.values(),
+            key=lambda e: (
+                -SEVERITY_RANK.get(e["severity"], 0),
+                -len(e["bundles"]),
+                e["issue_id"],
+                e["component"],
+            ),
+        )
+        severity_totals = {}
+        for entry in issues:
+            severity_totals[entry["severity"]] = (
+                severity_totals.get(entry["severity"], 0) + 1
+            )
+        return {
+            "watch_name": self.watch_name,
+            "total_violations": self.total,
+            "unique_issues": len(issues),
+            "severity_totals": severity_totals,
+            "issues": [
+                dict(
+                    entry,
+                    bundle_count=len(entry["bundles"]),
+                    bundles=sorted(entry["bundles"]),
+                    artifacts=sorted(entry["artifacts"]),
+                )
+                for entry in issues
+            ],
+        }
+
+
+def write_violations_json(output_file, data, pretty=False):
+    """
+    Writes violations to a JSON file, compact unless pretty is set.
+
+    Args:
+        output_file (str): Path of the JSON file.
+        data (dict): Data to write.
+        pretty (bool): Indent the JSON for human readers.
+    """
+    with open(output_file, "w") as f:
+        if pretty:
+            json.dump(data, f, indent=2)
+        else:
+            json.dump(data, f, separators=(",", ":"))
+
+
+def format_field(value, max_width=60, max_items=3):
+    """
+    Formats a violation field for a table cell, truncating lists and long text.
+
+    Args:
+        value: Field value; lists show at most max_items entries.
+        max_width (int): Maximum cell width in characters (0 disables truncation).
+        max_items (int): Maximum list entries shown before "(+N more)".
+
+    Returns:
+        str: Cell text.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        text = ", ".join(str(item) for item in value[:max_items])
+        if len(value) > max_items:
+            text += f" (+{len(value) - max_items} more)"
+    else:
+        text = str(value)
+    if max_width and len(text) > max_width:
+        text = text[: max_width - 3] + "..."
+    return text
+
+
+def display_violations_table(bundle_name, violations, top_n=50, max_width=60):
+    """
+    Prints severity counts and the top_n most severe violations of a bundle as a grid.
+
+    Args:
+        bundle_name (str): Release bundle name.
+        violations (list): Violations of the bundle.
+        top_n (int): Maximum rows in the grid (0 shows every row).
+        max_width (int): Maximum cell width in characters.
+    """
+    if not violations:
+        print(f"No violations found in response for bundle '{bundle_name}'.")
+        return
+
+    counts = {}
+    for v in violations:
+        severity = v.get("severity") or "Unknown"
+        counts[severity] = counts.get(severity, 0) + 1
+    shown = violations
+    if top_n and len(violations) > top_n:
+        shown = heapq.nsmallest(
+            top_n,
+            violations,
+            key=lambda v: (
+                -SEVERITY_RANK.get(v.get("severity"), 0),
+                # "created" may be null, which does not compare with strings
+                v.get("created") or "",
+            ),
+        )
+
+    rows = [[format_field(v.get(k), max_width) for k in SUMMARY_KEYS] for v in shown]
+    print(f"\nViolation Keys Table for bundle '{bundle_name}':")
+    print(
+        "Severity counts: "
+        + ", ".join(
+            f"{severity}={counts[severity]}"
+            for severity in sorted(counts, key=lambda k: -SEVERITY_RANK.get(k, 0))
+        )
+    )
+    print(tabulate(rows, headers=SUMMARY_KEYS, tablefmt="grid", disable_numparse=True))
+    if len(shown) < len(violations):
+        print(
+            f"Showing the {len(shown)} most severe of {len(violations)} violations (see --top_n or --table_format)."
+        )
+
+
+class ViolationRowWriter:
+    """
+    Streams violation rows of every bundle as CSV, TSV or NDJSON, without building a table.
+
+    Rows are written to path, or to stream (stdout by default) when path is not given.
+    """
+
+    def __init__(self, table_format, path=None, stream=None):
+        self.table_format = table_format
+        self.file = open(path, "w", newline="") if path else stream or sys.stdout
+        self.path = path
+        self.rows = 0
+        self.writer = None
+        if table_format in ("csv", "tsv"):
+            self.writer = csv.writer(
+                self.file, delimiter="," if table_format == "csv" else "\t"
+            )
+            self.writer.writerow(["bundle"] + SUMMARY_KEYS)
+
+    def write(self, bundle_name, violations):
+        """Writes the rows of one bundle."""
+        for v in violations:
+            if self.writer is not None:
+                self.writer.writerow(
+                    [bundle_name]
+                    + [
+                        (
+                            ";".join(str(item) for item in v.get(k))
+                            if isinstance(v.get(k), list)
+                            else v.get(k, "")
+                        )
+                        for k in SUMMARY_KEYS
+                    ]
+                )
+            else:
+                record = {"bundle": bundle_name}
+                record.update({k: v.get(k) for k in SUMMARY_KEYS})
+                self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self.rows += 1
+
+    def close(self):
+        if self.path:
+            self.file.close()
+            print(f"{self.rows} violation rows written to {self.path}")
+        else:
+            self.file.flush()
+
+
+def build_violations_body(args, watch_name, bundle, created_from):
+    """
+    Frames the violations request body for one bundle of a watch.
+    """
+    return {
+        "filters": {
+            "watch_name": watch_name,
+            "violation_type": args.violation_type,
+            "min_severity": args.min_severity,
+            "created_from": created_from,
+            "created_until": args.created_until,
+            "resources": {
+                "release_bundles_v2": [
+                    {
+                        "name": bundle.get("name", ""),
+                        "version": bundle.get("version", ""),
+                        "project": bundle.get("project", ""),
+                    }
+                ]
+            },
+        },
+        "pagination": {
+            "order_by": args.order_by,
+            "direction": args.direction,
+            "limit": args.limit,
+            "offset": args.offset,
+        },
+    }
+
+
+# Dense windows are not split below this duration, nor --shard_days set below it
+MIN_SHARD_WINDOW = timedelta(minutes=1)
+# Upper bound of --shard_days, within the range of timedelta
+MAX_SHARD_DAYS = 36500
+# Format of the created_from/created_until filters, as validated on input
+CREATED_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+
+def split_window(created_from, created_until, shard_days):
+    """
+    Splits a created_from/created_until range into consecutive sub-windows,
+    split on whole seconds.
+
+    Args:
+        created_from (datetime): Start of the range.
+        created_until (datetime): End of the range.
+        shard_days (float): Length of each sub-window in days.
+
+    Returns:
+        list: (start, end) datetime tuples covering the range.
+    """
+    step = timedelta(days=shard_days)
+    windows = []
+    start = created_from
+    while start < created_until:
+        end = min((start + step).replace(microsecond=0), created_until)
+        windows.append((start, end))
+        start = end
+    return windows or [(created_from, created_until)]
+
+
+def fetch_window(session, url, body, start, end, threshold, summary=False):
+    """
+    Fetches every page of a violations query restricted to one time window.
+
+    Returns:
+        list: The violations of the window, or None when the window holds more
+        than threshold violations and is long enough to be split further.
+    """
+    body = json.loads(json.dumps(body))
+    body["filters"]["created_from"] = start.strftime(CREATED_FORMAT)
+    body["filters"]["created_until"] = end.strftime(CREATED_FORMAT)
+    pagination = body["pagination"]
+    pagination["offset"] = 1
+    violations = []
+    while True:
+        data = post_violations(session, url, body, summary)
+        total = data.get("total_violations", 0)
+        if (
+            pagination["offset"] == 1
+            and threshold
+            and total > threshold
+            and end - start > MIN_SHARD_WINDOW
+        ):
+            return None
+        page = data.get("violations") or []
+        violations.extend(page)
+        if not page or len(violations) >= total:
+            return violations
+        pagination["offset"] += 1
+
+
+def fetch_sharded_violations(
+    session,
+    url,
+    body,
+    shard_days,
+    threshold,
+    shard_executor,
+    direction="asc",
+    summary=False,
+):
+    """
+    Fetches a violations query as parallel time-window shards and merges them.
+
+    Windows returning more than threshold violations are halved until they fit.
+    Windows share their boundaries, so violations on a boundary are de-duplicated
+    by issue_id + impacted artifact.
+
+    Args:
+        session (JFrogClient): Shared client.
+        url (str): Violations API URL.
+        body (dict): Request body covering the whole range.
+        shard_days (float): Initial sub-window length in days.
+        threshold (int): Split windows holding more violations than this (0 disables).
+        shard_executor (ThreadPoolExecutor): Pool running the window queries. It must
+            not be the pool running this function, since this function waits on it.
+        direction (str): Sort order of the merged result by created ("asc" or "desc").
+        summary (bool): Keep only SUMMARY_KEYS of each violation.
+
+    Returns:
+        list: Merged violations ordered by created.
+    """
+    filters = body["filters"]
+    windows = split_window(
+        parse_created(filters["created_from"]),
+        parse_created(filters["created_until"]),
+        shard_days,
+    )
+    pending = {
+        shard_executor.submit(
+            fetch_window, session, url, body, start, end, threshold, summary
+        ): (start, end)
+        for start, end in windows
+    }
+    merged = {}
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            start, end = pending.pop(future)
+            violations = future.result()
+            if violations is None:
+                # Windows are only split above MIN_SHARD_WINDOW, so both halves last whole seconds
+                middle = (start + (end - start) / 2).replace(microsecond=0)
+                for sub_start, sub_end in [(start, middle), (middle, end)]:
+                    sub_future = shard_executor.submit(
+                        fetch_window,
+                        session,
+                        url,
+                        body,
+                        sub_start,
+                        sub_end,
+                        threshold,
+                        summary,
+                    )
+                    pending[sub_future] = (sub_start, sub_end)
+                continue
+            for v in violations:
+                merged.setdefault(tuple(violation_keys(v)), v)
+
+    epoch = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(
+        merged.values(),
+        key=lambda v: parse_created(v.get("created")) or epoch,
+        reverse=direction == "desc",
+    )
+
+
+def fetch_bundle_violations(
+    session, url, body, fetch_all, shard=None, summary=False, on_page=None
+):
+    """
+    Runs the violations query of one bundle; safe to call from worker threads.
+
+    Args:
+        session (JFrogClient): Shared client.
+        url (str): Violations API URL.
+        body (dict): Request body.
+        fetch_all (bool): Walk every page instead of returning the requested page only.
+        shard (dict): Optional keyword arguments of fetch_sharded_violations; when
+            given, the query is split into time windows.
+        summary (bool): Keep only SUMMARY_KEYS of each violation.
+        on_page (callable): Called with each page of violations as soon as it
+            arrives, from the worker thread (with the merged result when sharded).
+
+    Returns:
+        tuple: (pages, json_response, content). pages is a list of violation lists;
+        json_response and content are the parsed and raw single-page response
+        (None when fetch_all is set or the response is not JSON).
+    """
+    if shard:
+        violations = fetch_sharded_violations(session, url, body, summary=summary, **shard)
+        if on_page is not None:
+            on_page(violations)
+        return [violations], None, None
+    if fetch_all:
+        pages = []
+        for page in iter_violation_pages(session, url, body, summary):
+            if on_page is not None:
+                on_page(page)
+            pages.append(page)
+        return pages, None, None
+
+    if summary:
+        # Summary responses are reduced while parsing, so the raw body is not kept
+        json_response, content = post_violations(session, url, body, summary), None
+    else:
+        response = session.post(url, json=body)
+        content = response.content
+        try:
+            json_response = response.json()
+        except ValueError:
+            json_response = None
+    violations = []
+    if isinstance(json_response, dict):
+        violations = json_response.get("violations") or []
+    if on_page is not None:
+        on_page(violations)
+    return [violations], json_response, content
+
+
+def violation_component_keys(violations):
+    """
+    Indexes violations by issue_id + infected component.
+
+    Returns:
+        dict: Violation keyed by (issue_id, component).
+    """
+    keyed = {}
+    for v in violations:
+        for component in v.get("infected_components") or [""]:
+            keyed.setdefault((v.get("issue_id", ""), component), v)
+    return keyed
+
+
+def compute_violation_delta(latest_violations, previous_violations):
+    """
+    Compares the violations of two versions of a bundle by issue_id + component.
+
+    Returns:
+        dict: "new", "resolved" and "unchanged" lists of compact entries.
+    """
+    latest = violation_component_keys(latest_violations)
+    previous = violation_component_keys(previous_violations)
+
+    def entries(keys, source):
+        return sorted(
+            (
+                {
+                    "issue_id": key[0],
+                    "component": key[1],
+                    "severity": source[key].get("severity"),
+                    "type": source[key].get("type"),
+                    "created": source[key].get("created"),
+                }
+                for key in keys
+            ),
+            key=lambda e: (
+                -SEVERITY_RANK.get(e["severity"], 0),
+                e["issue_id"],
+                e["component"],
+            ),
+        )
+
+    return {
+        "new": entries(latest.keys() - previous.keys(), latest),
+        "resolved": entries(previous.keys() - latest.keys(), previous),
+        "unchanged": entries(latest.keys() & previous.keys(), latest),
+    }
+
+
+def run_version_diff(
+    args, session, executor, url, release_bundles_by_watch, multi_watch, shard
+):
+    """
+    Writes a violation delta report between the latest and the previous version of every bundle.
+
+    Version lookups and both violation queries of every bundle are run on executor;
+    this function only waits on them from the main thread.
+    """
+    version_futures = {}
+    for watch_name, release_bundles_from_watch in release_bundles_by_watch.items():
+        for bundle in release_bundles_from_watch:
+            version_futures[(watch_name, bundle.get("name", ""))] = executor.submit(
+                get_release_bundle_versions,
+                session,
+                bundle.get("name", ""),
+                bundle.get("project"),
+            )
+
+    query_futures = []
+    for watch_name, release_bundles_from_watch in release_bundles_by_watch.items():
+        for bundle in release_bundles_from_watch:
+            bundle_name = bundle.get("name", "")
+            latest_version = bundle.get("version", "")
+            versions = version_futures[(watch_name, bundle_name)].result()
+            # The version created just before the latest one
+            if latest_version in versions:
+                versions = versions[versions.index(latest_version) + 1 :]
+            previous_version = next(
+                (v for v in versions if v and v != latest_version), None
+            )
+            if not previous_version:
+                print(
+                    f"No previous version of bundle '{bundle_name}' to compare with {latest_version}"
+                )
+                continue
+            previous_bundle = dict(bundle, version=previous_version)
+            futures = [
+                executor.submit(
+                    fetch_bundle_violations,
+                    session,
+                    url,
+                    build_violations_body(args, watch_name, b, args.created_from),
+                    True,
+                    shard,
+                    args.summary,
+                )
+                for b in (bundle, previous_bundle)
+            ]
+            query_futures.append(
+                (watch_name, bundle_name, latest_version, previous_version, futures)
+            )
+
+    summary_rows = []
+    for watch_name, bundle_name, latest_version, previous_version, futures in query_futures:
+        try:
+            latest_pages, previous_pages = [f.result()[0] for f in futures]
+        except Exception as e:
+            print(f"Failed to fetch violations for bundle '{bundle_name}': {e}")
+            continue
+        delta = compute_violation_delta(
+            [v for page in latest_pages for v in page],
+            [v for page in previous_pages for v in page],
+        )
+        file_prefix = f"{watch_name}_{bundle_name}" if multi_watch else bundle_name
+        delta_file = f"{file_prefix}_violations_delta.json"
+        write_violations_json(
+            delta_file,
+            {
+                "watch_name": watch_name,
+                "bundle_name": bundle_name,
+                "latest_version": latest_version,
+                "previous_version": previous_version,
+                "counts": {k: len(v) for k, v in delta.items()},
+                "new": delta["new"],
+                "resolved": delta["resolved"],
+            },
+            args.pretty,
+        )
+        print(
+            f"Delta for bundle '{bundle_name}' {previous_version} -> {latest_version} stored in {delta_file}"
+        )
+        summary_rows.append(
+            [
+                f"{watch_name}/{bundle_name}" if multi_watch else bundle_name,
+                previous_version,
+                latest_version,
+                len(delta["new"]),
+                sum(1 for e in delta["new"] if e["severity"] == "Critical"),
+                len(delta["resolved"]),
+                len(delta["unchanged"]),
+            ]
+        )
+
+    if summary_rows:
+        print("\nViolation delta between release bundle versions:")
+        print(
+            tabulate(
+                summary_rows,
+                headers=[
+                    "Bundle",
+                    "Previous",
+                    "Latest",
+                    "New",
+                    "New Critical",
+                    "Resolved",
+                    "Unchanged",
+                ],
+                tablefmt="grid",
+                disable_numparse=True,
+            )
+        )
+
+
+def get_report_since(args):
+    """Returns --report_since, defaulting to 24 hours ago."""
+    if args.report_since:
+        return args.report_since
+    return (datetime.now(timezone.utc) - timedelta(days=1)).replace(
+        microsecond=0
+    ).isoformat()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate violations from JFrog Xray")
+    # These are required unless --report_only is given, see the check below
+    parser.add_argument(
+        "--jfrog_url",
+        help="JFrog Xray URL (e.g., https://xray.example.com)",
+    )
+    parser.add_argument("--jfrog_token", help="Bearer token for authentication")
+    parser.add_argument(
+        "--watch_name",
+        nargs="+",
+        help="Name of the watch; several names and glob patterns (e.g., 'prod-*') can be given",
+    )
+    parser.add_argument(
+        "--violation_type", help="Type of violation (e.g., Security)"
+    )
+    parser.add_argument("--min_severity", help="Minimum severity (e.g., High)")
+    parser.add_argument(
+        "--created_from",
+        help="Start date/time (e.g., 2025-06-16T18:22:04+00:00)",
+    )
+    parser.add_argument(
+        "--created_until",
+        help="End date/time (e.g., 2025-07-17T18:22:04+00:00)",
+    )
+    parser.add_argument("--order_by", default="created")
+    parser.add_argument("--direction", default="asc")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--offset", type=int, default=1)
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch violations created since the last run and append them to <bundle_name>_violations_store.ndjson",
+    )
+    parser.add_argument(
+        "--state_file",
+        default="violations_state.json",
+        help="State file holding the last seen violation per watch and bundle (used with --incremental)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of concurrent Xray requests",
+    )
+    parser.add_argument(
+        "--diff_previous",
+        action="store_true",
+        help="Compare the violations of the latest and the previous version of each bundle and write <bundle_name>_violations_delta.json",
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Keep only the fields shown in the summary table, dropping the rest while parsing (streams with ijson when installed)",
+    )
+    parser.add_argument(
+        "--shard_days",
+        type=float,
+        help="Split the created_from/created_until range into windows of this many days, queried in parallel",
+    )
+    parser.add_argument(
+        "--shard_threshold",
+        type=int,
+        default=10000,
+        help="Split a window further while it holds more violations than this (0 disables, used with --shard_days)",
+    )
+    parser.add_argument(
+        "--table_format",
+        choices=["grid", "csv", "tsv", "ndjson"],
+        default="grid",
+        help="Format of the violation table; csv, tsv and ndjson stream every row",
+    )
+    parser.add_argument(
+        "--table_file",
+        help="Write csv/tsv/ndjson rows to this file instead of stdout (where rows keep stdout to themselves)",
+    )
+    parser.add_argument(
+        "--top_n",
+        type=int,
+        default=50,
+        help="Maximum rows per bundle in the grid, most severe first (0 shows every row)",
+    )
+    parser.add_argument(
+        "--max_field_width",
+        type=int,
+        default=60,
+        help="Maximum width of a grid cell; longer values and lists are truncated (0 disables)",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        help="Cache watch and release bundle metadata in this directory between runs",
+    )
+    parser.add_argument(
+        "--cache_ttl",
+        type=int,
+        default=3600,
+        help="Seconds a cached response without ETag/Last-Modified stays valid (used with --cache_dir)",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON output files and the printed request body",
+    )
+    parser.add_argument(
+        "--no_json",
+        action="store_true",
+        help="Do not write <bundle_name>_violations.json files",
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="Also write <watch_name>_aggregated_violations.json, one entry per issue_id + component across all bundles",
+    )
+    parser.add_argument(
+        "--export_columnar",
+        help="Also write one flattened row per violation x component x artifact to this file (requires pyarrow)",
+    )
+    parser.add_argument(
+        "--columnar_format",
+        choices=["parquet", "arrow"],
+        default="parquet",
+        help="File format of --export_columnar",
+    )
+    parser.add_argument(
+        "--sqlite_db",
+        help="Ingest violations into this local SQLite database (used by --report)",
+    )
+    parser.add_argument(
+        "--report",
+        choices=sorted(REPORT_QUERIES),
+        help="Report to generate from --sqlite_db after ingesting",
+    )
+    parser.add_argument(
+        "--report_since",
+        help="Only report violations created at or after this date/time (default: 24 hours ago)",
+    )
+    parser.add_argument(
+        "--report_top", type=int, default=20, help="Maximum rows in the report"
+    )
+    parser.add_argument(
+        "--report_only",
+        action="store_true",
+        help="Generate --report from --sqlite_db without querying Xray",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the latency of every Xray endpoint at exit (also JFROG_PROFILE=1)",
+    )
+    parser.add_argument(
+        "--profile_json",
+        help="Also write the run profile to this JSON file (also JFROG_PROFILE_JSON)",
+    )
+    args = parser.parse_args()
+    profiling.configure(args.profile, args.profile_json)
+
+    # Rows streamed to stdout must stay parseable, so diagnostics go to stderr
+    rows_stream = sys.stdout
+    if args.table_format != "grid" and not args.table_file:
+        sys.stdout = sys.stderr
+
+    if args.shard_days is not None and not (
+        MIN_SHARD_WINDOW / timedelta(days=1) <= args.shard_days <= MAX_SHARD_DAYS
+    ):
+        parser.error(
+            f"--shard_days must be between {MIN_SHARD_WINDOW / timedelta(days=1):.6f} (one minute) and {MAX_SHARD_DAYS}"
+        )
+    if args.report and not args.sqlite_db:
+        parser.error("--report requires --sqlite_db")
+    if args.report_only:
+        if not args.report:
+            parser.error("--report_only requires --report")
+        conn = open_violation_db(args.sqlite_db)
+        run_report(conn, args.report, get_report_since(args), args.report_top)
+        conn.close()
+        return
+
+    for required in [
+        "jfrog_url",
+        "jfrog_token",
+        "watch_name",
+        "violation_type",
+        "min_severity",
+        "created_from",
+        "created_until",
+    ]:
+        if getattr(args, required) is None:
+            parser.error(f"the following arguments are required: --{required}")
+
+    # Validate created_from and created_until dates
+    if not validatecreateddate(args.created_from):
+        print(
+            "Error: Invalid format for --created_from. Expected format: YYYY-MM-DDTHH:MM:SS+ZZZZ"
+        )
+        sys.exit(1)
+    if not validatecreateddate(args.created_until):
+        print(
+            "Error: Invalid format for --created_until. Expected format: YYYY-MM-DDTHH:MM:SS+ZZZZ"
+        )
+        sys.exit(1)
+
+    # Validate severity
+    if not validateSeverity(args.min_severity):
+        print("Error: Invalid severity level provided.")
+        sys.exit(1)
+
+    session = create_session(
+        args.jfrog_token,
+        pool_size=args.workers * 2 if args.shard_days else args.workers,
+        jfrog_url=args.jfrog_url,
+    )
+    cache = ResponseCache(args.cache_dir, args.cache_ttl) if args.cache_dir else None
+    watch_names = resolve_watch_names(session, args.watch_name, cache)
+    if not watch_names:
+        print("Error: No watches to process.")
+        sys.exit(1)
+    multi_watch = len(watch_names) > 1
+
+    # Window queries run in their own pool since bundle workers wait on them
+    shard_executor = ThreadPoolExecutor(max_workers=args.workers) if args.shard_days else None
+    shard = None
+    if shard_executor is not None:
+        shard = {
+            "shard_days": args.shard_days,
+            "threshold": args.shard_threshold,
+            "shard_executor": shard_executor,
+            "direction": args.direction,
+        }
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        # Get release bundles from every watch, and the release bundle catalog once, concurrently
+        catalog_future = executor.submit(get_all_release_bundles, session, cache)
+        watch_futures = {
+            name: executor.submit(get_release_bundles_from_watch, session, name, cache)
+            for name in watch_names
+        }
+        bundles_by_name = index_release_bundles(catalog_future.result())
+        release_bundles_by_watch = {
+            name: future.result() for name, future in watch_futures.items()
+        }
+
+        # Update each bundle in the watches to use the latest version
+        for release_bundles_from_watch in release_bundles_by_watch.values():
+            for bundle in release_bundles_from_watch:
+                bundle_details = bundles_by_name.get(bundle.get("name", ""))
+                if bundle_details:
+                    latest_version = bundle_details.get(
+                        "release_bundle_version_latest", ""
+                    )
+                    project_key = bundle_details.get("project_key", "")
+                    bundle["version"] = latest_version
+                    bundle["project"] = project_key
+
+        url = f"{args.jfrog_url}/xray/api/v1/violations"
+        if args.diff_previous:
+            run_version_diff(
+                args,
+                session,
+                executor,
+                url,
+                release_bundles_by_watch,
+                multi_watch,
+                shard,
+            )
+            if shard_executor is not None:
+                shard_executor.shutdown()
+            return
+
+        state = load_state(args.state_file) if args.incremental else {}
+        db_conn = open_violation_db(args.sqlite_db) if args.sqlite_db else None
+        exporter = (
+            ColumnarExporter(args.export_columnar, args.columnar_format)
+            if args.export_columnar
+            else None
+        )
+        aggregators = (
+            {name: ViolationAggregator(name) for name in watch_names}
+            if args.aggregate
+            else {}
+        )
+        row_writer = (
+            ViolationRowWriter(args.table_format, args.table_file, rows_stream)
+            if args.table_format != "grid"
+            else None
+        )
+
+        # Consumers of every violation of a bundle need every page, not just
+        # the --offset page the default mode returns
+        fetch_all = (
+            args.incremental or args.aggregate or args.sqlite_db or args.export_columnar
+        )
+
+        # Fan out the violation queries of every bundle of every watch
+        futures = {}
+        for watch_name, release_bundles_from_watch in release_bundles_by_watch.items():
+            watch_state = state.setdefault(watch_name, {})
+            for bundle in release_bundles_from_watch:
+                bundle_name = bundle.get("name", "")
+                created_from = args.created_from
+                if args.incremental:
+                    created_from = get_incremental_created_from(
+                        created_from, watch_state.setdefault(bundle_name, {})
+                    )
+                body = build_violations_body(args, watch_name, bundle, created_from)
+                print(
+                    f"Requesting violations for bundle '{bundle_name}' of watch '{watch_name}' from {url} with filters: {json.dumps(body, indent=2 if args.pretty else None)}"
+                )
+                future = executor.submit(
+                    fetch_bundle_violations,
+                    session,
+                    url,
+                    body,
+                    fetch_all,
+                    shard,
+                    args.summary,
+                    (
+                        partial(
+                            exporter.write_page,
+                            watch_name,
+                            bundle_name,
+                            bundle.get("version", ""),
+                        )
+                        if exporter is not None
+                        else None
+                    ),
+                )
+                futures[future] = (watch_name, bundle, created_from)
+
+        # Store and display the results in the main thread as they complete
+        for future in as_completed(futures):
+            watch_name, bundle, created_from = futures[future]
+            bundle_name = bundle.get("name", "")
+            bundle_version = bundle.get("version", "")
+            # Keep the historical file names unless several watches are processed
+            file_prefix = f"{watch_name}_{bundle_name}" if multi_watch else bundle_name
+            output_file = None if args.no_json else f"{file_prefix}_violations.json"
+            try:
+                pages, json_response, content = future.result()
+            except Exception as e:
+                print(f"Failed to fetch violations for bundle '{bundle_name}': {e}")
+                continue
+            violations = [v for page in pages for v in page]
+
+            if args.incremental:
+                bundle_state = state[watch_name][bundle_name]
+                store_file = f"{file_prefix}_violations_store.ndjson"
+                convert_legacy_store(
+                    f"{file_prefix}_violations_store.json", store_file, bundle_state
+                )
+                new_violations = select_new_violations(bundle_state, violations)
+                append_violations(store_file, new_violations, bundle_state)
+                update_bundle_state(bundle_state, violations)
+                save_state(args.state_file, state)
+                print(
+                    f"Fetched {len(violations)} violations for bundle '{bundle_name}' since {created_from}, {len(new_violations)} new, appended to {store_file}"
+                )
+                if output_file:
+                    write_violations_json(
+                        output_file,
+                        {
+                            "total_violations": len(new_violations),
+                            "violations": new_violations,
+                        },
+                        args.pretty,
+                    )
+                table_violations = new_violations
+            else:
+                if output_file:
+                    if content is None:
+                        # Sharded, paged and summary queries have no single raw body
+                        write_violations_json(
+                            output_file,
+                            {
+                                "total_violations": len(violations),
+                                "violations": violations,
+                            },
+                            args.pretty,
+                        )
+                    elif json_response is not None and args.pretty:
+                        write_violations_json(output_file, json_response, args.pretty)
+                    else:
+                        # The response body is already compact JSON (or an error text), store it as is
+                        with open(output_file, "wb") as f:
+                            f.write(content)
+                table_violations = violations
+
+            if output_file:
+                print(f"Output stored in {output_file}")
+
+            if watch_name in aggregators:
+                aggregators[watch_name].add(bundle_name, bundle_version, violations)
+
+            if db_conn is not None:
+                rows = ingest_violations(
+                    db_conn, watch_name, bundle_name, bundle_version, violations
+                )
+                print(f"Ingested {rows} violation rows into {args.sqlite_db}")
+
+            # Display keys in table format, straight from the parsed response
+            table_label = f"{watch_name}/{bundle_name}" if multi_watch else bundle_name
+            try:
+                if row_writer is not None:
+                    row_writer.write(table_label, table_violations)
+                else:
+                    display_violations_table(
+                        table_label, table_violations, args.top_n, args.max_field_width
+                    )
+            except Exception as e:
+                print(
+                    f"Failed to extract/display violation keys for bundle '{bundle_name}': {e}"
+                )
+
+    if shard_executor is not None:
+        shard_executor.shutdown()
+
+    if row_writer is not None:
+        row_writer.close()
+
+    if exporter is not None:
+        exporter.close()
+
+    for watch_name, aggregator in aggregators.items():
+        aggregated = aggregator.report()
+        aggregate_file = f"{watch_name}_aggregated_violations.json"
+        write_violations_json(aggregate_file, aggregated, args.pretty)
+        print(
+            f"\nAggregated {aggregated['total_violations']} violations into {aggregated['unique_issues']} unique issues, stored in {aggregate_file}"
+        )
+        summary_rows = [
+            [
+                entry["severity"],
+                entry["issue_id"],
+                entry["component"],
+                entry["bundle_count"],
+                len(entry["artifacts"]),
+            ]
+            for entry in aggregated["issues"][:20]
+        ]
+        if summary_rows:
+            print(
+                tabulate(
+                    summary_rows,
+                    headers=["Severity", "Issue ID", "Component", "Bundles", "Artifacts"],
+                    tablefmt="grid",
+                )
+            )
+
+    if db_conn is not None:
+        if args.report:
+            run_report(db_conn, args.report, get_report_since(args), args.report_top)
+        db_conn.close()
 
 
 if __name__ == "__main__":
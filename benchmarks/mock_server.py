@@ -0,0 +1,885 @@
+"""
+Local stand-in for the JFrog Platform (Artifactory, Access, Xray, Lifecycle)
+and GitHub Packages, serving the endpoints used by the scripts of this
+repository from synthetic data, so they can be tested and benchmarked offline.
+
+URL layout, one server hosting several Artifactory instances:
+    {url}/...               "source" instance, holding the synthetic repositories
+    {url}/<instance>/...    any other instance (e.g. {url}/target), starting empty
+    {url}/github/...        GitHub REST API (GITHUB_API_URL)
+    {url}/npm/...           GitHub npm registry (NPM_REGISTRY_URL)
+    {url}/_mock/stats       request counters; POST {url}/_mock/reset clears them
+
+Usage:
+    python mock_server.py --port 8081 --repos 20000 --violations 100000 --latency_ms 20
+"""
+
+import argparse
+import base64
+import fnmatch
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+# The shared JFrog REST client lives at the root of the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from jfrog_client import compile_endpoint  # noqa: E402
+
+# First path segments that are services, not Artifactory instance names
+SERVICES = {"artifactory", "access", "xray", "lifecycle", "github", "npm", "_mock"}
+PACKAGE_TYPES = ["maven", "npm", "docker", "pypi", "generic", "nuget"]
+SEVERITIES = ["Critical", "High", "Medium", "Low"]
+# Synthetic violations are created one VIOLATION_INTERVAL apart from VIOLATIONS_START
+VIOLATIONS_START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+VIOLATION_INTERVAL = timedelta(minutes=1)
+GITHUB_MAX_PER_PAGE = 100
+
+ROUTES = [
+    ("GET", "_mock/stats", "mock_stats"),
+    ("POST", "_mock/reset", "mock_reset"),
+    ("GET", "artifactory/api/repositories", "list_repositories"),
+    ("GET", "artifactory/api/repositories/configurations", "repository_configurations"),
+    ("GET", "artifactory/api/repositories/{repo}", "get_repository"),
+    ("PUT", "artifactory/api/repositories/{repo}", "create_repository"),
+    ("GET", "artifactory/api/storageinfo", "storage_info"),
+    ("POST", "artifactory/api/storageinfo/calculate", "calculate_storage"),
+    ("GET", "artifactory/api/replications/{repo}", "get_replications"),
+    ("PUT", "artifactory/api/replications/{repo}", "set_replication"),
+    ("POST", "artifactory/api/replication/execute/{repo}", "execute_replication"),
+    ("GET", "artifactory/api/replication/{repo}", "replication_status"),
+    ("POST", "artifactory/api/search/aql", "aql"),
+    ("POST", "artifactory/api/npm/{repo}/reindex", "schedule"),
+    ("POST", "artifactory/api/maven/calculateMetadata/{path:path}", "schedule"),
+    ("PUT", "artifactory/{repo}/{path:path}", "deploy"),
+    ("PUT", "access/api/v1/projects/_/attach/repositories/{repo}/{project}", "attach_repository"),
+    ("GET", "xray/api/v2/watches", "list_watches"),
+    ("GET", "xray/api/v2/watches/{name}", "get_watch"),
+    ("POST", "xray/api/v1/violations", "violations"),
+    ("GET", "lifecycle/api/v2/release_bundle/groups", "release_bundle_groups"),
+    ("GET", "lifecycle/api/v2/release_bundle/records/{name}", "release_bundle_records"),
+    ("GET", "github/{owner_type}/{owner}/packages", "github_packages"),
+    ("GET", "github/{owner_type}/{owner}/packages/{package_type}/{package}/versions", "github_versions"),
+    ("GET", "npm/download/{scope}/{package}/-/{file}", "npm_tarball"),
+    ("GET", "npm/{scope}/{package}", "npm_packument"),
+]
+
+
+def parse_time(value):
+    """Parses an ISO 8601 timestamp ("Z" or offset) into an aware datetime."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def format_time(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class MockConfig:
+    """
+    Synthetic data and fault injection settings of the mock server.
+
+    Args:
+        repos (int): Repositories of the source instance (70% local, 15% remote,
+            10% virtual, 5% federated).
+        watches (int): Xray watches, named bench-watch-<n>.
+        bundles_per_watch (int): Release bundles of each watch.
+        violations (int): Violations, spread evenly over every bundle of every watch.
+        packages (int): GitHub packages of the organization.
+        versions_per_package (int): Versions of each GitHub package.
+        tarball_kb (int): Size of each npm tarball.
+        latency_ms (float): Mean added latency of a response.
+        jitter_ms (float): Standard deviation of the added latency.
+        error_rate (float): Fraction of requests answered with 429.
+        retry_after (int): Retry-After of the injected 429 answers, in seconds.
+        github_rate_limit (int): GitHub requests per hour before 403s (0: unlimited).
+        org (str): GitHub organization.
+        npm_scope (str): npm scope of the GitHub packages.
+        seed (int): Seed of the latency and fault injection.
+    """
+
+    def __init__(
+        self,
+        repos=2000,
+        watches=2,
+        bundles_per_watch=5,
+        violations=10000,
+        packages=20,
+        versions_per_package=5,
+        tarball_kb=16,
+        latency_ms=0.0,
+        jitter_ms=0.0,
+        error_rate=0.0,
+        retry_after=1,
+        github_rate_limit=5000,
+        org="bench-org",
+        npm_scope="@bench",
+        seed=0,
+    ):
+        self.repos = repos
+        self.watches = watches
+        self.bundles_per_watch = bundles_per_watch
+        self.violations = violations
+        self.packages = packages
+        self.versions_per_package = versions_per_package
+        self.tarball_kb = tarball_kb
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.github_rate_limit = github_rate_limit
+        self.org = org
+        self.npm_scope = npm_scope
+        self.seed = seed
+
+    def to_dict(self):
+        return dict(vars(self))
+
+
+def repo_class(index):
+    position = index % 20
+    if position < 14:
+        return "local"
+    if position < 17:
+        return "remote"
+    if position < 19:
+        return "virtual"
+    return "federated"
+
+
+def repo_key(index):
+    return f"{PACKAGE_TYPES[index % len(PACKAGE_TYPES)]}-{repo_class(index)}-{index:05d}"
+
+
+def repo_config(index, base_url):
+    """Configuration of synthetic repository `index`, as returned by the repositories API."""
+    rclass = repo_class(index)
+    package_type = PACKAGE_TYPES[index % len(PACKAGE_TYPES)]
+    config = {
+        "key": repo_key(index),
+        "rclass": rclass,
+        "packageType": package_type,
+        "description": f"Synthetic {rclass} {package_type} repository",
+        "repoLayoutRef": "maven-2-default" if package_type == "maven" else "simple-default",
+    }
+    if rclass == "remote":
+        config["url"] = f"https://registry.example.com/{package_type}/"
+    elif rclass == "virtual":
+        # Up to two local repositories of the same package type
+        members = [
+            repo_key(j)
+            for j in range(index - 1, max(-1, index - 121), -1)
+            if repo_class(j) == "local" and j % len(PACKAGE_TYPES) == index % len(PACKAGE_TYPES)
+        ][:2]
+        config["repositories"] = members
+        if members:
+            config["defaultDeploymentRepo"] = members[0]
+    elif rclass == "federated":
+        config["members"] = [{"url": f"{base_url}/artifactory/{repo_key(index)}", "enabled": True}]
+    return config
+
+
+class Instance:
+    """Mutable state of one mocked Artifactory instance."""
+
+    def __init__(self, repos):
+        self.lock = threading.Lock()
+        self.repos = repos  # key -> configuration
+        self.replications = {}  # key -> replication configurations
+        self.items = {}  # repo -> {path: checksums and size}
+        self.binaries = set()  # sha1 of every deployed file
+        self.configurations = None  # Serialized configurations, reset on change
+
+
+class MockJFrogServer:
+    """
+    Threaded HTTP server answering the mocked endpoints.
+
+        server = MockJFrogServer(MockConfig(repos=20000)).start()
+        ... run a script against server.url ...
+        print(server.stats())
+        server.stop()
+    """
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        self.config = config or MockConfig()
+        self.routes = [
+            (method, template, compile_endpoint(template), handler)
+            for method, template, handler in ROUTES
+        ]
+        self.random = random.Random(self.config.seed)
+        self.random_lock = threading.Lock()
+        self.instances = {}
+        self.instances_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.reset_stats()
+        self.github_window = (time.time(), 0)
+        self.httpd = ThreadingHTTPServer((host, port), MockRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.request_queue_size = 256
+        self.httpd.mock = self
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves in a background thread. Returns the server."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    # --- Statistics ---
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.counts = {}
+            self.injected = 0
+            self.bytes_sent = 0
+
+    def count(self, method, endpoint):
+        with self.stats_lock:
+            self.counts[(method, endpoint)] = self.counts.get((method, endpoint), 0) + 1
+
+    def stats(self):
+        """Requests served since the last reset, per endpoint."""
+        with self.stats_lock:
+            return {
+                "requests": sum(self.counts.values()),
+                "injected_429": self.injected,
+                "bytes_sent": self.bytes_sent,
+                "endpoints": [
+                    {"method": method, "endpoint": endpoint, "count": count}
+                    for (method, endpoint), count in sorted(
+                        self.counts.items(), key=lambda item: -item[1]
+                    )
+                ],
+            }
+
+    # --- Request handling ---
+
+    def instance(self, name):
+        with self.instances_lock:
+            if name not in self.instances:
+                repos = {}
+                if name == "source":
+                    for index in range(self.config.repos):
+                        config = repo_config(index, self.url)
+                        repos[config["key"]] = config
+                self.instances[name] = Instance(repos)
+            return self.instances[name]
+
+    def route(self, method, path):
+        """Returns (template, handler name, path parameters) of a request, or None."""
+        for route_method, template, pattern, handler in self.routes:
+            if route_method == method:
+                match = pattern.fullmatch(path)
+                if match:
+                    return template, handler, match.groupdict()
+        return None
+
+    def delay(self):
+        if self.config.latency_ms or self.config.jitter_ms:
+            with self.random_lock:
+                latency = self.random.gauss(self.config.latency_ms, self.config.jitter_ms)
+            time.sleep(max(0.0, latency) / 1000)
+
+    def inject_error(self):
+        if not self.config.error_rate:
+            return False
+        with self.random_lock:
+            injected = self.random.random() < self.config.error_rate
+        if injected:
+            with self.stats_lock:
+                self.injected += 1
+        return injected
+
+    def handle(self, method, raw_path, headers, body):
+        """Answers a request. Returns (status, payload, headers)."""
+        split = urlsplit(raw_path)
+        segments = unquote(split.path).strip("/").split("/", 1)
+        if segments[0] in SERVICES:
+            instance, path = "source", "/".join(segments)
+        else:
+            instance, path = segments[0], segments[1] if len(segments) > 1 else ""
+        route = self.route(method, path)
+        if route is None:
+            self.count(method, "(unknown)")
+            return 404, {"errors": [{"status": 404, "message": f"No mock for {method} /{path}"}]}, {}
+        template, handler, params = route
+        if handler.startswith("mock_"):
+            return getattr(self, handler)(None)
+        self.count(method, template)
+        self.delay()
+        if self.inject_error():
+            return (
+                429,
+                {"errors": [{"status": 429, "message": "Too Many Requests"}]},
+                {"Retry-After": str(self.config.retry_after)},
+            )
+        request = SimpleNamespace(
+            instance=self.instance(instance),
+            params=params,
+            query={k: v[-1] for k, v in parse_qs(split.query).items()},
+            headers=headers,
+            body=body,
+            base_url=f"http://{headers.get('Host')}",
+        )
+        return getattr(self, handler)(request)
+
+    # --- Mock control ---
+
+    def mock_stats(self, request):
+        return 200, self.stats(), {}
+
+    def mock_reset(self, request):
+        self.reset_stats()
+        return 200, {"reset": True}, {}
+
+    # --- Artifactory ---
+
+    def list_repositories(self, request):
+        with request.instance.lock:
+            repos = list(request.instance.repos.values())
+        return (
+            200,
+            [
+                {
+                    "key": repo["key"],
+                    "type": repo["rclass"].upper(),
+                    "packageType": repo.get("packageType"),
+                    "url": f"{request.base_url}/artifactory/{repo['key']}",
+                }
+                for repo in repos
+            ],
+            {},
+        )
+
+    def repository_configurations(self, request):
+        instance = request.instance
+        with instance.lock:
+            if instance.configurations is None:
+                grouped = {}
+                for repo in instance.repos.values():
+                    grouped.setdefault(repo["rclass"].upper(), []).append(repo)
+                instance.configurations = json.dumps(grouped).encode()
+            return 200, instance.configurations, {"Content-Type": "application/json"}
+
+    def get_repository(self, request):
+        with request.instance.lock:
+            repo = request.instance.repos.get(request.params["repo"])
+        if repo is None:
+            return 400, {"errors": [{"status": 400, "message": "Bad Request"}]}, {}
+        return 200, repo, {}
+
+    def create_repository(self, request):
+        key = request.params["repo"]
+        config = json.loads(request.body or b"{}")
+        with request.instance.lock:
+            if key in request.instance.repos:
+                return 400, {"errors": [{"status": 400, "message": f"Repository {key} already exists"}]}, {}
+            request.instance.repos[key] = dict(config, key=key)
+            request.instance.configurations = None
+        return 200, f"Successfully created repository '{key}'".encode(), {"Content-Type": "text/plain"}
+
+    def storage_info(self, request):
+        summaries = []
+        with request.instance.lock:
+            repos = list(request.instance.repos.values())
+        for index, repo in enumerate(repos):
+            files = (index * 37) % 5000
+            summaries.append(
+                {
+                    "repoKey": repo["key"],
+                    "repoType": {"remote": "CACHE"}.get(repo["rclass"], repo["rclass"].upper()),
+                    "foldersCount": files // 10,
+                    "filesCount": files,
+                    "usedSpace": f"{files * 0.25:.2f} MB",
+                    "usedSpaceInBytes": files * 262144,
+                    "itemsCount": files + files // 10,
+                    "packageType": repo.get("packageType", "Generic").capitalize(),
+                    "percentage": "0%",
+                }
+            )
+        return (
+            200,
+            {
+                "binariesSummary": {"binariesCount": str(len(request.instance.binaries))},
+                "fileStoreSummary": {"storageType": "file-system"},
+                "repositoriesSummaryList": summaries,
+            },
+            {},
+        )
+
+    def calculate_storage(self, request):
+        if not request.headers.get("Authorization"):
+            return 401, {"errors": [{"status": 401, "message": "Unauthorized"}]}, {}
+        return 202, {"info": "Calculating storage summary scheduled to run successfully"}, {}
+
+    def get_replications(self, request):
+        with request.instance.lock:
+            replications = request.instance.replications.get(request.params["repo"])
+        if not replications:
+            return 404, {"errors": [{"status": 404, "message": "Could not find replication"}]}, {}
+        return 200, replications, {}
+
+    def set_replication(self, request):
+        config = json.loads(request.body or b"{}")
+        with request.instance.lock:
+            request.instance.replications[request.params["repo"]] = [
+                dict(config, repoKey=request.params["repo"])
+            ]
+        return 201, None, {}
+
+    def execute_replication(self, request):
+        repo = request.params["repo"]
+        with request.instance.lock:
+            replications = request.instance.replications.get(repo)
+        if not replications:
+            return 400, {"messages": [{"level": "ERROR", "message": f"No replication configured for {repo}"}]}, {}
+        return (
+            202,
+            {
+                "messages": [
+                    {"level": "INFO", "message": f"Pushing repository '{repo}' to '{r['url']}' in the background."}
+                    for r in replications
+                ]
+            },
+            {},
+        )
+
+    def replication_status(self, request):
+        with request.instance.lock:
+            replicated = request.params["repo"] in request.instance.replications
+        return (
+            200,
+            {
+                "status": "ok" if replicated else "never_run",
+                "lastCompleted": format_time(VIOLATIONS_START) if replicated else "never",
+            },
+            {},
+        )
+
+    def attach_repository(self, request):
+        return 204, None, {}
+
+    def schedule(self, request):
+        return 200, b"Reindexing scheduled", {"Content-Type": "text/plain"}
+
+    def deploy(self, request):
+        repo, path = request.params["repo"], request.params["path"]
+        instance = request.instance
+        if request.headers.get("X-Checksum-Deploy", "").lower() == "true":
+            sha1 = request.headers.get("X-Checksum-Sha1")
+            with instance.lock:
+                known = sha1 in instance.binaries
+            if not known:
+                return 404, {"errors": [{"status": 404, "message": "Checksum deploy failed"}]}, {}
+            checksums = {
+                "sha1": sha1,
+                "sha256": request.headers.get("X-Checksum-Sha256"),
+                "md5": request.headers.get("X-Checksum"),
+            }
+            size = None
+        else:
+            checksums = {
+                algorithm: hashlib.new(algorithm, request.body).hexdigest()
+                for algorithm in ("sha1", "sha256", "md5")
+            }
+            size = len(request.body)
+        with instance.lock:
+            instance.binaries.add(checksums["sha1"])
+            instance.items.setdefault(repo, {})[path] = dict(checksums, size=size)
+        return (
+            201,
+            {"repo": repo, "path": f"/{path}", "size": str(size), "checksums": checksums},
+            {},
+        )
+
+    def aql(self, request):
+        query = request.body.decode()
+        repo = re.search(r'"repo"\s*:\s*"([^"]+)"', query)
+        pattern = re.search(r'"\$match"\s*:\s*"([^"]+)"', query)
+        offset = re.search(r"\.offset\((\d+)\)", query)
+        limit = re.search(r"\.limit\((\d+)\)", query)
+        with request.instance.lock:
+            items = dict(request.instance.items.get(repo.group(1), {})) if repo else {}
+        results = []
+        for full_path in sorted(items):
+            folder, _, name = full_path.rpartition("/")
+            if pattern and not fnmatch.fnmatchcase(name, pattern.group(1)):
+                continue
+            checksums = items[full_path]
+            results.append(
+                {
+                    "repo": repo.group(1),
+                    "path": folder or ".",
+                    "name": name,
+                    "sha1": checksums["sha1"],
+                    "sha256": checksums["sha256"],
+                }
+            )
+        start = int(offset.group(1)) if offset else 0
+        end = start + int(limit.group(1)) if limit else None
+        page = results[start:end]
+        return (
+            200,
+            {"results": page, "range": {"start_pos": start, "end_pos": start + len(page), "total": len(page)}},
+            {},
+        )
+
+    # --- Xray and Lifecycle ---
+
+    def watch_names(self):
+        return [f"bench-watch-{w}" for w in range(self.config.watches)]
+
+    def bundle_names(self, watch):
+        return [f"{watch.replace('watch', 'bundle')}-{b}" for b in range(self.config.bundles_per_watch)]
+
+    def list_watches(self, request):
+        return 200, [{"general_data": {"name": name}} for name in self.watch_names()], {}
+
+    def get_watch(self, request):
+        name = request.params["name"]
+        if name not in self.watch_names():
+            return 404, {"error": f"Watch {name} not found"}, {}
+        return (
+            200,
+            {
+                "general_data": {"name": name, "active": True},
+                "project_resources": {
+                    "resources": [
+                        {"type": "releaseBundleV2", "name": bundle, "bin_mgr_id": "default"}
+                        for bundle in self.bundle_names(name)
+                    ]
+                },
+            },
+            {},
+        )
+
+    def violations_per_bundle(self):
+        bundles = max(1, self.config.watches * self.config.bundles_per_watch)
+        return math.ceil(self.config.violations / bundles)
+
+    @staticmethod
+    def violation(watch, bundle, index):
+        created = VIOLATIONS_START + index * VIOLATION_INTERVAL
+        issue = f"XRAY-{int(hashlib.md5(f'{bundle}{index}'.encode()).hexdigest()[:8], 16)}"
+        return {
+            "description": f"Synthetic vulnerability {index} of {bundle}",
+            "severity": SEVERITIES[index % len(SEVERITIES)],
+            "type": "security",
+            "infected_components": [f"npm://component-{index % 500}:1.{index % 10}.0"],
+            "created": format_time(created),
+            "watch_name": watch,
+            "issue_id": issue,
+            "violation_details_url": f"https://xray.example.com/ui/violations/{issue}",
+            "impacted_artifacts": [f"default/release-bundles-v2/{bundle}/1.0.0/artifact-{index % 50}.tgz"],
+        }
+
+    def violations(self, request):
+        body = json.loads(request.body or b"{}")
+        filters = body.get("filters", {})
+        pagination = body.get("pagination", {})
+        watch = filters.get("watch_name")
+        bundles = (filters.get("resources") or {}).get("release_bundles_v2") or []
+        bundle = bundles[0].get("name") if bundles else None
+        if watch not in self.watch_names() or bundle not in self.bundle_names(watch):
+            return 200, {"total_violations": 0, "violations": []}, {}
+
+        # Violation i was created at VIOLATIONS_START + i * VIOLATION_INTERVAL
+        count = self.violations_per_bundle()
+        first, last = 0, count
+        if filters.get("created_from"):
+            since = parse_time(filters["created_from"]) - VIOLATIONS_START
+            first = max(first, math.ceil(since / VIOLATION_INTERVAL))
+        if filters.get("created_until"):
+            until = parse_time(filters["created_until"]) - VIOLATIONS_START
+            last = min(last, math.floor(until / VIOLATION_INTERVAL) + 1)
+        total = max(0, last - first)
+
+        limit = int(pagination.get("limit") or 100)
+        page = max(1, int(pagination.get("offset") or 1))
+        start = (page - 1) * limit
+        indexes = range(first, last)
+        if pagination.get("direction") == "desc":
+            indexes = indexes[::-1]
+        return (
+            200,
+            {
+                "total_violations": total,
+                "violations": [self.violation(watch, bundle, i) for i in indexes[start : start + limit]],
+            },
+            {},
+        )
+
+    def release_bundles(self):
+        return [
+            {
+                "repository_key": "release-bundles-v2",
+                "release_bundle_name": bundle,
+                "release_bundle_version_latest": "1.0.2",
+                "project_key": "default",
+            }
+            for watch in self.watch_names()
+            for bundle in self.bundle_names(watch)
+        ]
+
+    def release_bundle_groups(self, request):
+        bundles = self.release_bundles()
+        limit = int(request.query.get("limit", 25))
+        offset = int(request.query.get("offset", 0))
+        return 200, {"release_bundles": bundles[offset : offset + limit], "total": len(bundles)}, {}
+
+    def release_bundle_records(self, request):
+        name = request.params["name"]
+        return (
+            200,
+            {
+                "release_bundles": [
+                    {
+                        "release_bundle_name": name,
+                        "release_bundle_version": f"1.0.{v}",
+                        "created": format_time(VIOLATIONS_START + timedelta(days=v)),
+                    }
+                    for v in range(3)
+                ],
+                "total": 3,
+            },
+            {},
+        )
+
+    # --- GitHub ---
+
+    def github_rate_limit(self):
+        """Counts a GitHub API call. Returns (headers, exceeded)."""
+        limit = self.config.github_rate_limit
+        with self.stats_lock:
+            window_start, used = self.github_window
+            if time.time() - window_start >= 3600:
+                window_start, used = time.time(), 0
+            used += 1
+            self.github_window = (window_start, used)
+        if not limit:
+            return {}, False
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(max(0, limit - used)),
+            "X-RateLimit-Used": str(min(used, limit)),
+            "X-RateLimit-Reset": str(int(window_start + 3600)),
+            "X-RateLimit-Resource": "core",
+        }
+        return headers, used > limit
+
+    def github_page(self, request, items, path):
+        """One page of a GitHub list, with the Link header of the other pages."""
+        headers, exceeded = self.github_rate_limit()
+        if exceeded:
+            return 403, {"message": "API rate limit exceeded"}, headers
+        per_page = min(GITHUB_MAX_PER_PAGE, int(request.query.get("per_page", 30)))
+        page = max(1, int(request.query.get("page", 1)))
+        pages = max(1, math.ceil(len(items) / per_page))
+        links = []
+        for rel, number in (("next", page + 1), ("last", pages), ("first", 1), ("prev", page - 1)):
+            if 1 <= number <= pages and number != page:
+                query = urlencode(dict(request.query, per_page=per_page, page=number))
+                links.append(f'<{request.base_url}/github/{path}?{query}>; rel="{rel}"')
+        if links:
+            headers["Link"] = ", ".join(links)
+        return 200, items[(page - 1) * per_page : page * per_page], headers
+
+    def package_names(self):
+        return [f"pkg-{i:04d}" for i in range(self.config.packages)]
+
+    def github_packages(self, request):
+        package_type = request.query.get("package_type", "npm")
+        packages = [
+            {
+                "id": i + 1,
+                "name": name,
+                "package_type": package_type,
+                "visibility": "private",
+                "repository": {"name": "bench-repo"},
+            }
+            for i, name in enumerate(self.package_names())
+        ]
+        params = request.params
+        return self.github_page(request, packages, f"{params['owner_type']}/{params['owner']}/packages")
+
+    def package_versions(self):
+        return [f"1.{v}.0" for v in range(self.config.versions_per_package)]
+
+    def github_versions(self, request):
+        params = request.params
+        if params["package"] not in self.package_names():
+            headers, _ = self.github_rate_limit()
+            return 404, {"message": "Package not found."}, headers
+        versions = [
+            {
+                "id": v + 1,
+                "name": version,
+                "metadata": {
+                    "package_type": params["package_type"],
+                    "container": {"tags": [version]},
+                },
+            }
+            for v, version in enumerate(reversed(self.package_versions()))
+        ]
+        path = "/".join(
+            [params["owner_type"], params["owner"], "packages", params["package_type"], params["package"], "versions"]
+        )
+        return self.github_page(request, versions, path)
+
+    @lru_cache(maxsize=4096)
+    def tarball(self, package, version):
+        """Content of a synthetic npm tarball and its SRI integrity and shasum."""
+        seed = hashlib.sha256(f"{package}@{version}".encode()).digest()
+        content = (seed * (self.config.tarball_kb * 1024 // len(seed) + 1))[: self.config.tarball_kb * 1024]
+        integrity = "sha512-" + base64.b64encode(hashlib.sha512(content).digest()).decode()
+        return content, integrity, hashlib.sha1(content).hexdigest()
+
+    def npm_packument(self, request):
+        scope, package = request.params["scope"], request.params["package"]
+        if scope != self.config.npm_scope or package not in self.package_names():
+            return 404, {"error": "Not found"}, {}
+        versions = {}
+        for version in self.package_versions():
+            _, integrity, shasum = self.tarball(package, version)
+            versions[version] = {
+                "name": f"{scope}/{package}",
+                "version": version,
+                "dist": {
+                    "tarball": f"{request.base_url}/npm/download/{scope}/{package}/-/{package}-{version}.tgz",
+                    "integrity": integrity,
+                    "shasum": shasum,
+                },
+            }
+        return 200, {"name": f"{scope}/{package}", "versions": versions}, {}
+
+    def npm_tarball(self, request):
+        package, file_name = request.params["package"], request.params["file"]
+        version = file_name[len(package) + 1 : -len(".tgz")]
+        if version not in self.package_versions():
+            return 404, {"error": "Not found"}, {}
+        content, _, _ = self.tarball(package, version)
+        return 200, content, {"Content-Type": "application/octet-stream"}
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real services
+    server_version = "MockJFrog/1.0"
+    # Headers and body are written separately; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def respond(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload, headers = self.server.mock.handle(method, self.path, self.headers, body)
+        headers = dict(headers)
+        if payload is None:
+            data = b""
+        elif isinstance(payload, bytes):
+            data = payload
+        else:
+            data = json.dumps(payload).encode()
+            headers.setdefault("Content-Type", "application/json")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(data)
+        with self.server.mock.stats_lock:
+            self.server.mock.bytes_sent += len(data)
+
+    def do_GET(self):
+        self.respond("GET")
+
+    def do_HEAD(self):
+        self.respond("HEAD")
+
+    def do_POST(self):
+        self.respond("POST")
+
+    def do_PUT(self):
+        self.respond("PUT")
+
+    def do_DELETE(self):
+        self.respond("DELETE")
+
+
+def config_arguments(parser):
+    """Adds the MockConfig options to an argument parser."""
+    defaults = MockConfig()
+    for name, help_text in [
+        ("repos", "Repositories of the source instance"),
+        ("watches", "Xray watches"),
+        ("bundles_per_watch", "Release bundles of each watch"),
+        ("violations", "Violations, spread over every bundle of every watch"),
+        ("packages", "GitHub packages"),
+        ("versions_per_package", "Versions of each GitHub package"),
+        ("tarball_kb", "Size of each npm tarball in KB"),
+        ("latency_ms", "Mean added latency of a response in milliseconds"),
+        ("jitter_ms", "Standard deviation of the added latency in milliseconds"),
+        ("error_rate", "Fraction of requests answered with 429"),
+        ("retry_after", "Retry-After of the injected 429 answers, in seconds"),
+        ("github_rate_limit", "GitHub requests per hour (0: unlimited)"),
+        ("seed", "Seed of the latency and fault injection"),
+    ]:
+        default = getattr(defaults, name)
+        parser.add_argument(
+            f"--{name}", type=type(default), default=default, help=f"{help_text} (default: {default})"
+        )
+    parser.add_argument("--org", default=defaults.org, help="GitHub organization")
+    parser.add_argument("--npm_scope", default=defaults.npm_scope, help="npm scope of the GitHub packages")
+
+
+def config_from_args(args):
+    return MockConfig(**{name: getattr(args, name) for name in MockConfig().to_dict()})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mock JFrog Platform and GitHub Packages server for offline tests and benchmarks."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockJFrogServer(config_from_args(args), args.host, args.port)
+    print(f"Mock server listening on {server.url}")
+    print(f"  Source Artifactory/Xray: {server.url}")
+    print(f"  Target Artifactory:      {server.url}/target")
+    print(f"  GITHUB_API_URL:          {server.url}/github")
+    print(f"  NPM_REGISTRY_URL:        {server.url}/npm")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+End-to-end benchmarks of the scripts of this repository against the mock
+JFrog/GitHub server (mock_server.py). Each scenario runs one command as a
+subprocess and records its wall time, the requests it sent to the mock
+server and its peak RSS. Compare against a saved baseline to catch
+regressions offline.
+
+Usage:
+    python run_benchmarks.py --output baseline.json
+    python run_benchmarks.py --baseline baseline.json --tolerance 0.2
+    python run_benchmarks.py --preset large --latency_ms 20 --scenarios violations_fetch_all
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from tabulate import tabulate
+
+from mock_server import MockJFrogServer, config_arguments, config_from_args, repo_key
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+PUSH_REPLICATION = os.path.join(REPO_ROOT, "push-replication", "push_replication.py")
+GENERATE_VIOLATIONS = os.path.join(REPO_ROOT, "Generate_XRAY_Violations", "generateviolations.py")
+MIGRATE_GITHUB_PACKAGES = os.path.join(
+    REPO_ROOT, "migration_scripts", "migrate_github_packages", "migrate_github_packages.py"
+)
+
+PRESETS = {
+    "small": {},
+    "large": {"repos": 20000, "violations": 100000, "packages": 200, "versions_per_package": 10},
+}
+# Metrics compared with the baseline; a higher value is a regression
+COMPARED_METRICS = ["wall_s", "requests", "peak_rss_mb"]
+
+
+def replication_command(command):
+    def build(server, workdir):
+        return [
+            sys.executable,
+            PUSH_REPLICATION,
+            "--source-url",
+            server.url,
+            "--source-token",
+            "bench-token",
+            "--target-url",
+            f"{server.url}/target",
+            "--target-token",
+            "bench-token",
+            "--repo_mapping_file",
+            os.path.join(workdir, "repo_mapping.txt"),
+            "--replication_user",
+            "replicator",
+            "--replication_password",
+            "bench-password",
+            command,
+        ]
+
+    return build
+
+
+def violations_command(*extra_args):
+    def build(server, workdir):
+        return [
+            sys.executable,
+            GENERATE_VIOLATIONS,
+            "--jfrog_url",
+            server.url,
+            "--jfrog_token",
+            "bench-token",
+            "--watch_name",
+            "bench-watch-*",
+            "--violation_type",
+            "Security",
+            "--min_severity",
+            "Low",
+            "--created_from",
+            "2024-12-31T00:00:00+0000",
+            "--created_until",
+            "2026-01-01T00:00:00+0000",
+            "--incremental",
+            *extra_args,
+        ]
+
+    return build
+
+
+def migration_command(package_type):
+    def build(server, workdir):
+        return [
+            sys.executable,
+            MIGRATE_GITHUB_PACKAGES,
+            "--package_type",
+            package_type,
+            "--repo",
+            f"{package_type}-bench-local",
+            "--state_db",
+            os.path.join(workdir, "migration_state.db"),
+        ]
+
+    return build
+
+
+# (name, command builder). The replication scenarios depend on each other and run in this order.
+SCENARIOS = [
+    ("replication_create_repos", replication_command("create_repos_with_new_names")),
+    ("replication_create_push", replication_command("create_push_replication_between_source_and_target")),
+    ("replication_trigger", replication_command("trigger_push_replication_on_source")),
+    ("replication_status", replication_command("get_replication_status_between_source_and_target")),
+    ("violations_fetch_all", violations_command()),
+    ("violations_summary", violations_command("--summary")),
+    ("violations_sharded", violations_command("--shard_days", "1")),
+    ("github_npm_migration", migration_command("npm")),
+]
+
+
+def write_repo_mapping(path, config, mapped_repos):
+    """Maps the first mapped_repos synthetic repositories to "<key>-new"."""
+    with open(path, "w") as f:
+        for index in range(min(config.repos, mapped_repos)):
+            f.write(f"{repo_key(index)},{repo_key(index)}-new\n")
+
+
+def scenario_env(server, config):
+    return dict(
+        os.environ,
+        GITHUB_ORG=config.org,
+        GITHUB_ORG_TYPE="orgs",
+        GITHUB_PAT="bench-pat",
+        GITHUB_API_URL=f"{server.url}/github",
+        NPM_SCOPE=config.npm_scope,
+        NPM_REGISTRY_URL=f"{server.url}/npm",
+        JFROG_URL=server.url,
+        ARTIFACTORY_TOKEN="bench-token",
+        UPLOAD_METHOD="native",
+        PYTHONUNBUFFERED="1",
+    )
+
+
+def run_command(argv, cwd, env, log_path):
+    """
+    Runs a command to completion with its output in log_path.
+
+    Returns:
+        tuple: (exit code, wall time in seconds, peak RSS in MB or None).
+    """
+    started = time.perf_counter()
+    with open(log_path, "wb") as log:
+        process = subprocess.Popen(argv, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, "wait4"):
+            # The rusage of this child only, unlike RUSAGE_CHILDREN
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+            peak_rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        else:
+            process.wait()
+            peak_rss = None
+    return process.returncode, time.perf_counter() - started, peak_rss
+
+
+def run_scenarios(server, config, names, workdir, mapped_repos):
+    write_repo_mapping(os.path.join(workdir, "repo_mapping.txt"), config, mapped_repos)
+    env = scenario_env(server, config)
+    results = []
+    for name, build in SCENARIOS:
+        if names and name not in names:
+            continue
+        cwd = os.path.join(workdir, name)
+        os.makedirs(cwd, exist_ok=True)
+        log_path = os.path.join(cwd, "output.log")
+        print(f"Running {name}...", flush=True)
+        server.reset_stats()
+        exit_code, wall, peak_rss = run_command(build(server, workdir), cwd, env, log_path)
+        stats = server.stats()
+        results.append(
+            {
+                "scenario": name,
+                "exit_code": exit_code,
+                "wall_s": round(wall, 3),
+                "requests": stats["requests"],
+                "injected_429": stats["injected_429"],
+                "mb_received": round(stats["bytes_sent"] / (1024 * 1024), 2),
+                "peak_rss_mb": round(peak_rss, 1) if peak_rss is not None else None,
+                "endpoints": stats["endpoints"],
+                "log": log_path,
+            }
+        )
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """
+    Returns the regressions of results against a baseline run, as
+    (scenario, metric, baseline value, value) tuples.
+    """
+    previous = {r["scenario"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        base = previous.get(result["scenario"])
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if base.get(metric) is None or result.get(metric) is None:
+                continue
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append((result["scenario"], metric, base[metric], result[metric]))
+    return regressions
+
+
+def main():
+    preset_parser = argparse.ArgumentParser(add_help=False)
+    preset_parser.add_argument(
+        "--preset",
+        choices=sorted(PRESETS),
+        default="small",
+        help="Synthetic data scale; large is 20k repositories and 100k violations (default: small)",
+    )
+    preset, _ = preset_parser.parse_known_args()
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scripts of this repository against the mock JFrog/GitHub server.",
+        parents=[preset_parser],
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=[name for name, _ in SCENARIOS],
+        help="Scenarios to run (default: all). The replication scenarios expect the earlier ones to have run.",
+    )
+    parser.add_argument(
+        "--mapped_repos",
+        type=int,
+        default=None,
+        help="Repositories in the replication mapping file (default: all of --repos)",
+    )
+    parser.add_argument("--workdir", help="Directory for the scenario outputs and logs (default: a new temporary directory)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed increase over the baseline before a metric counts as a regression (default: 0.2)",
+    )
+    config_arguments(parser)
+    parser.set_defaults(**PRESETS[preset.preset])
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="jfrog-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    server = MockJFrogServer(config).start()
+    print(f"Mock server on {server.url}, outputs in {workdir}")
+    try:
+        results = run_scenarios(
+            server,
+            config,
+            args.scenarios,
+            workdir,
+            args.mapped_repos if args.mapped_repos is not None else config.repos,
+        )
+    finally:
+        server.stop()
+
+    print()
+    print(
+        tabulate(
+            [
+                [
+                    r["scenario"],
+                    r["exit_code"],
+                    f"{r['wall_s']:.2f}",
+                    r["requests"],
+                    r["injected_429"],
+                    r["mb_received"],
+                    r["peak_rss_mb"],
+                ]
+                for r in results
+            ],
+            headers=["Scenario", "Exit", "Wall (s)", "Requests", "429s", "MB received", "Peak RSS (MB)"],
+            tablefmt="grid",
+        )
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "preset": args.preset,
+                    "config": config.to_dict(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"Results written to {args.output}")
+
+    failed = [r["scenario"] for r in results if r["exit_code"] != 0]
+    for name in failed:
+        print(f"FAILED: {name} (see {os.path.join(workdir, name, 'output.log')})")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions against the baseline:")
+            print(
+                tabulate(
+                    regressions,
+                    headers=["Scenario", "Metric", "Baseline", "Now"],
+                    tablefmt="grid",
+                )
+            )
+        else:
+            print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Shared JFrog Platform REST client of the scripts in this repository.
+
+Scripts outside this directory import it after putting the repository root
+on sys.path, e.g.:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    from jfrog_client import JFrogClient
+"""
+
+from . import profiling
+from .aio import AsyncJFrogClient
+from .client import (
+    IDEMPOTENT_METHODS,
+    RETRY_STATUSES,
+    BaseClient,
+    JFrogClient,
+    compile_endpoint,
+    expand_path,
+)
+from .profiling import RunProfile
+from .stats import LatencyHistogram, LatencyStats
+
+__all__ = [
+    "AsyncJFrogClient",
+    "BaseClient",
+    "IDEMPOTENT_METHODS",
+    "JFrogClient",
+    "LatencyHistogram",
+    "LatencyStats",
+    "RETRY_STATUSES",
+    "RunProfile",
+    "compile_endpoint",
+    "expand_path",
+    "profiling",
+]
@@ -0,0 +1,144 @@
+"""
+Optional asyncio backend of the JFrog REST client, over httpx. Same URL
+building, endpoint labels, retry policy and latency statistics as
+JFrogClient, for callers fanning out thousands of small requests from a
+single thread.
+"""
+
+import asyncio
+import time
+
+from . import profiling
+from .client import BaseClient, content_length
+
+try:
+    import httpx
+except ImportError:
+    # Optional: only AsyncJFrogClient needs it
+    httpx = None
+
+
+class AsyncJFrogClient(BaseClient):
+    """
+    asyncio client over a pooled httpx.AsyncClient.
+
+        async with AsyncJFrogClient("https://mycompany.jfrog.io", token) as client:
+            configs = await client.map(
+                lambda repo: client.get_json(
+                    "artifactory/api/repositories/{repo}", path_params={"repo": repo}
+                ),
+                repos,
+                concurrency=32,
+            )
+
+    Takes the arguments of JFrogClient; request keyword arguments are the
+    ones of httpx (content/data/json/params/headers).
+    """
+
+    def __init__(
+        self,
+        base_url=None,
+        token=None,
+        headers=None,
+        pool_size=10,
+        verify=True,
+        timeout=None,
+        **kwargs,
+    ):
+        if httpx is None:
+            raise ImportError("AsyncJFrogClient needs httpx: pip install httpx")
+        super().__init__(base_url, **kwargs)
+        default_headers = {"Authorization": f"Bearer {token}"} if token else {}
+        default_headers.update(headers or {})
+        self.client = httpx.AsyncClient(
+            headers=default_headers,
+            verify=verify,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            ),
+        )
+
+    @property
+    def headers(self):
+        return self.client.headers
+
+    async def request(self, method, path, path_params=None, endpoint=None, retry=None, **kwargs):
+        """Sends a request; see JFrogClient.request. Returns an httpx.Response."""
+        url, endpoint = self.resolve(path, path_params, endpoint)
+        profile = profiling.current()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            if profile is not None:
+                profile.begin("http")
+            try:
+                response = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self.record(profile, method, endpoint, started)
+                if not self.should_retry(method, attempt, retry=retry):
+                    raise
+                delay = self.retry_delay(attempt)
+            except BaseException:
+                # Includes cancellation, which ends the attempt as well
+                self.record(profile, method, endpoint, started)
+                raise
+            else:
+                self.record(
+                    profile,
+                    method,
+                    endpoint,
+                    started,
+                    response.status_code,
+                    content_length(response.request.headers),
+                    response.num_bytes_downloaded,
+                )
+                if not self.should_retry(method, attempt, response.status_code, retry):
+                    return response
+                delay = self.retry_delay(attempt, response.headers.get("Retry-After"))
+                await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def head(self, path, **kwargs):
+        return await self.request("HEAD", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.request("PUT", path, **kwargs)
+
+    async def patch(self, path, **kwargs):
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+    async def get_json(self, path, **kwargs):
+        """GET returning the parsed JSON body; raises httpx.HTTPStatusError on error statuses."""
+        response = await self.get(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def map(self, func, items, concurrency=10):
+        """Awaits func(item) for every item, at most `concurrency` at a time. Results keep the order of items."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
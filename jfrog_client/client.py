@@ -0,0 +1,401 @@
+"""
+Pooled, retrying HTTP client for the JFrog Platform REST APIs (Artifactory,
+Xray, Lifecycle, Access), shared by the scripts of this repository.
+"""
+
+import email.utils
+import random
+import re
+import time
+from urllib.parse import quote, urlsplit
+
+import requests
+
+from . import profiling
+from .stats import LatencyStats
+
+try:
+    import ijson
+except ImportError:
+    # Optional: only iter_json_events needs it
+    ijson = None
+
+# Rejected before being processed (429) or transient server/proxy errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+# "{name}" matches one path segment, "{name:path}" the rest of the path
+TEMPLATE_FIELD = re.compile(r"\{(\w+)(:path)?\}")
+# Segments replaced by "{id}" in the endpoint label of URLs matching no template
+ID_SEGMENT = re.compile(
+    r"\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F-]{36}|sha\d+:[0-9a-fA-F]+"
+)
+
+
+def compile_endpoint(template):
+    """Regular expression matching the paths of an endpoint template, one named group per field."""
+    pattern, last = "", 0
+    for field in TEMPLATE_FIELD.finditer(template):
+        pattern += re.escape(template[last : field.start()])
+        pattern += f"(?P<{field.group(1)}>{'.+' if field.group(2) else '[^/]+'})"
+        last = field.end()
+    return re.compile(pattern + re.escape(template[last:]))
+
+
+def expand_path(template, path_params):
+    """Fills an endpoint template with URL-quoted values."""
+    return TEMPLATE_FIELD.sub(
+        lambda field: quote(
+            str(path_params[field.group(1)]),
+            safe="/@:" if field.group(2) else "@:",
+        ),
+        template,
+    )
+
+
+def retry_after_seconds(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def content_length(headers):
+    """Content-Length of a request or response, None when absent (e.g. chunked)."""
+    value = headers.get("Content-Length")
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+class BaseClient:
+    """
+    URL building, endpoint labels and retry policy shared by JFrogClient
+    (requests) and AsyncJFrogClient (httpx), independent of the HTTP library.
+
+    Args:
+        base_url (str): JFrog Platform URL (e.g. https://mycompany.jfrog.io).
+            Paths are relative to it; absolute URLs are used as they are.
+        retries (int): Retries of a failed request.
+        backoff (float): Base of the exponential backoff, in seconds. Each
+            retry waits a random time up to backoff * 2**attempt (full jitter),
+            or the Retry-After of the response.
+        max_backoff (float): Upper bound of the jittered backoff.
+        retry_statuses (tuple): Statuses retried.
+        retry_methods (set): Methods retried on any of retry_statuses and on
+            connection errors. Other methods are only retried on 429.
+        endpoints (list): Endpoint templates (e.g.
+            "xray/api/v2/watches/{name}") used to label absolute URLs and
+            untemplated paths in the latency statistics.
+        stats (LatencyStats): Statistics to record into, e.g. shared by
+            several clients. A new one by default.
+    """
+
+    def __init__(
+        self,
+        base_url=None,
+        retries=3,
+        backoff=0.5,
+        max_backoff=30.0,
+        retry_statuses=RETRY_STATUSES,
+        retry_methods=IDEMPOTENT_METHODS,
+        endpoints=(),
+        stats=None,
+    ):
+        self.base_url = base_url.rstrip("/") if base_url else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_methods = frozenset(m.upper() for m in retry_methods)
+        self.endpoints = [(template, compile_endpoint(template)) for template in endpoints]
+        self.stats = stats if stats is not None else LatencyStats()
+
+    def resolve(self, path, path_params=None, endpoint=None):
+        """
+        Returns the URL of a request and its endpoint label. A templated path
+        ("api/replications/{repo}" with path_params) is its own label.
+        """
+        if path_params is not None:
+            endpoint = endpoint or path
+            path = expand_path(path, path_params)
+        if path.startswith(("http://", "https://")):
+            url = path
+        elif self.base_url:
+            url = f"{self.base_url}/{path.lstrip('/')}"
+        else:
+            raise ValueError(f"relative path {path} needs a base_url")
+        return url, endpoint or self.endpoint_for(url)
+
+    def endpoint_for(self, url):
+        """Endpoint label of a URL: the matching template, else its path with ids replaced."""
+        parts = urlsplit(url)
+        if self.base_url and url.startswith(f"{self.base_url}/"):
+            prefix, path = "", url[len(self.base_url) + 1 :].split("?", 1)[0]
+        else:
+            prefix, path = f"{parts.netloc}/", parts.path.lstrip("/")
+        for template, pattern in self.endpoints:
+            if pattern.fullmatch(path):
+                return prefix + template
+        return prefix + "/".join(
+            "{id}" if ID_SEGMENT.fullmatch(segment) else segment
+            for segment in path.split("/")
+        )
+
+    def record(
+        self, profile, method, endpoint, started, status=None, bytes_sent=None, bytes_received=None
+    ):
+        """Records a request attempt in stats and, when profiling, in the run profile."""
+        seconds = time.perf_counter() - started
+        self.stats.record(method, endpoint, seconds, status, bytes_sent, bytes_received)
+        if profile is not None:
+            profile.end(
+                "http",
+                method,
+                endpoint,
+                seconds,
+                status,
+                bytes_sent=bytes_sent,
+                bytes_received=bytes_received,
+            )
+
+    def should_retry(self, method, attempt, status=None, retry=None):
+        """Whether a request that failed with `status` (None: no response) is retried."""
+        if attempt >= self.retries:
+            return False
+        if retry is None:
+            retry = method.upper() in self.retry_methods
+        if status is None:
+            return retry
+        return status in self.retry_statuses and (retry or status == 429)
+
+    def retry_delay(self, attempt, retry_after=None):
+        """Seconds to wait before a retry: Retry-After when given, else full jitter."""
+        delay = retry_after_seconds(retry_after)
+        if delay is not None:
+            return delay
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class JFrogClient(BaseClient):
+    """
+    Blocking client over a pooled requests.Session.
+
+    Requests take a path relative to base_url or an absolute URL, and the
+    keyword arguments of requests, so a client can stand in for a
+    requests.Session. Responses are returned as they are; only the JSON
+    helpers raise on error statuses.
+
+        client = JFrogClient("https://mycompany.jfrog.io", token)
+        client.get("artifactory/api/replications/{repo}", path_params={"repo": "libs"})
+
+    Args:
+        token (str): Access token, sent as a Bearer Authorization header.
+        headers (dict): Headers sent with every request.
+        pool_size (int): Pooled connections per host; match the number of threads.
+        verify (bool): Verify TLS certificates.
+        timeout (float): Default timeout of a request, in seconds.
+        Other arguments are described in BaseClient.
+    """
+
+    def __init__(
+        self,
+        base_url=None,
+        token=None,
+        headers=None,
+        pool_size=10,
+        verify=True,
+        timeout=None,
+        **kwargs,
+    ):
+        super().__init__(base_url, **kwargs)
+        self.timeout = timeout
+        self.session = requests.Session()
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self.session.headers.update(headers or {})
+        self.session.verify = verify
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @property
+    def headers(self):
+        return self.session.headers
+
+    def request(self, method, path, path_params=None, endpoint=None, retry=None, **kwargs):
+        """
+        Sends a request, retrying it per the retry policy, and records its
+        latency (until the response headers arrive), status and bytes under its
+        endpoint label, in stats and in the run profile when profiling is on.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Path relative to base_url, endpoint template or absolute URL.
+            path_params (dict): Values of the template fields of path.
+            endpoint (str): Endpoint label, overriding the derived one.
+            retry (bool): Retry this request on any retry status, whatever its method.
+            **kwargs: Arguments of requests.Session.request.
+
+        Returns:
+            requests.Response: The last response.
+        """
+        url, endpoint = self.resolve(path, path_params, endpoint)
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        body = kwargs.get("data")
+        position = body.tell() if hasattr(body, "seek") else None
+        # A generator or unseekable stream cannot be sent twice
+        replayable = position is not None or body is None or isinstance(
+            body, (bytes, str, dict, list, tuple)
+        )
+
+        profile = profiling.current()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            if profile is not None:
+                profile.begin("http")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                self.record(profile, method, endpoint, started)
+                if not replayable or not self.should_retry(method, attempt, retry=retry):
+                    raise
+                delay = self.retry_delay(attempt)
+            except Exception:
+                # Not retried (e.g. an invalid URL), but still ends the attempt
+                self.record(profile, method, endpoint, started)
+                raise
+            else:
+                bytes_received = content_length(response.headers)
+                if bytes_received is None and not kwargs.get("stream"):
+                    bytes_received = len(response.content)
+                self.record(
+                    profile,
+                    method,
+                    endpoint,
+                    started,
+                    response.status_code,
+                    content_length(response.request.headers),
+                    bytes_received,
+                )
+                if not replayable or not self.should_retry(
+                    method, attempt, response.status_code, retry
+                ):
+                    return response
+                delay = self.retry_delay(attempt, response.headers.get("Retry-After"))
+                response.close()
+            attempt += 1
+            if position is not None:
+                body.seek(position)
+            time.sleep(delay)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def head(self, path, **kwargs):
+        kwargs.setdefault("allow_redirects", False)
+        return self.request("HEAD", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def get_json(self, path, **kwargs):
+        """GET returning the parsed JSON body; raises requests.HTTPError on error statuses."""
+        response = self.get(path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def iter_json_events(self, method, path, **kwargs):
+        """
+        Yields the ijson (prefix, event, value) events of a JSON response,
+        parsed as a stream, for callers that keep some fields of large
+        responses without building the rest. Needs ijson. Raises
+        requests.HTTPError on error statuses.
+        """
+        if ijson is None:
+            raise ImportError("iter_json_events needs ijson: pip install ijson")
+        with self.request(method, path, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield from ijson.parse(response.raw, use_float=True)
+
+    def paginate_offset(
+        self,
+        path,
+        items_key,
+        total_key="total",
+        limit=100,
+        params=None,
+        get_json=None,
+        **kwargs,
+    ):
+        """
+        Yields the items of a GET endpoint paginated with limit/offset query
+        parameters (e.g. lifecycle/api/v2/release_bundle/groups), until
+        `total_key` items or a short page were read. Pages are fetched with
+        get_json(path, params=..., **kwargs), e.g. through a response cache;
+        self.get_json by default.
+        """
+        get_json = get_json or self.get_json
+        offset = 0
+        while True:
+            page = get_json(
+                path, params=dict(params or {}, limit=limit, offset=offset), **kwargs
+            )
+            items = page.get(items_key) or []
+            yield from items
+            offset += len(items)
+            total = page.get(total_key)
+            if len(items) < limit or (total is not None and offset >= total):
+                return
+
+    def iter_aql(self, query, page_size=10000):
+        """
+        Yields the results of an AQL query ('items.find(...).include(...)',
+        without offset/limit), fetched page_size results at a time.
+        Include a .sort() in the query so the pages are stable.
+        """
+        offset = 0
+        while True:
+            response = self.post(
+                "artifactory/api/search/aql",
+                data=f"{query}.offset({offset}).limit({page_size})",
+                headers={"Content-Type": "text/plain"},
+                retry=True,
+            )
+            response.raise_for_status()
+            results = response.json().get("results", [])
+            yield from results
+            if len(results) < page_size:
+                return
+            offset += page_size
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
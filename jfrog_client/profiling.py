@@ -0,0 +1,222 @@
+"""
+Run profile of the scripts in this repository: the method, endpoint template,
+status, bytes and latency of every HTTP call made through the JFrog clients
+and of every subprocess started with run(), reported when the script exits.
+
+Profiling is off until enable() or configure() is called; until then a
+request only pays for one module attribute lookup.
+
+    profiling.configure(args.profile, args.profile_json)  # or JFROG_PROFILE=1
+"""
+
+import atexit
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from .stats import LatencyStats
+
+# The run profile being recorded, None when profiling is off
+_active = None
+
+# Rows of the printed report; the JSON file always holds every endpoint
+REPORT_ROWS = 25
+
+
+def current():
+    """The active RunProfile, or None when profiling is off."""
+    return _active
+
+
+class RunProfile:
+    """
+    Per-endpoint statistics of a whole run, and how its wall time splits
+    between network calls, subprocesses and local work.
+
+    Concurrent calls overlap, so the network time is the time during which at
+    least one HTTP call was in flight (likewise for subprocesses), and the
+    local time is the time during which neither was. The latency of an HTTP
+    call ends when its response is returned: for streamed responses that is
+    when the headers arrive, before the body is read.
+    """
+
+    def __init__(self, json_path=None):
+        self.json_path = json_path
+        self.started = time.perf_counter()
+        self.stats = LatencyStats()
+        self.lock = threading.Lock()
+        # Per kind ("http", "exec", "any"): calls in flight, since when, busy seconds
+        self.in_flight = {"http": 0, "exec": 0, "any": 0}
+        self.busy_since = {}
+        self.busy = {"http": 0.0, "exec": 0.0, "any": 0.0}
+
+    def begin(self, kind):
+        """Marks the start of an HTTP call ("http") or subprocess ("exec")."""
+        now = time.perf_counter()
+        with self.lock:
+            for key in (kind, "any"):
+                if not self.in_flight[key]:
+                    self.busy_since[key] = now
+                self.in_flight[key] += 1
+
+    def end(self, kind, method, endpoint, seconds, status=None, **kwargs):
+        """
+        Marks the end of a call started with begin() and records it; kwargs
+        are the bytes_sent, bytes_received and error of LatencyStats.record.
+        """
+        now = time.perf_counter()
+        with self.lock:
+            for key in (kind, "any"):
+                self.in_flight[key] -= 1
+                if not self.in_flight[key]:
+                    self.busy[key] += now - self.busy_since.pop(key)
+        self.stats.record(method, endpoint, seconds, status, **kwargs)
+
+    def report(self):
+        """The profile as a JSON-serializable dict."""
+        now = time.perf_counter()
+        with self.lock:
+            # Calls still in flight count up to now
+            busy = {
+                key: seconds + (now - self.busy_since[key] if key in self.busy_since else 0.0)
+                for key, seconds in self.busy.items()
+            }
+        endpoints = self.stats.summary()
+        wall = now - self.started
+        return {
+            "wall_s": wall,
+            "network_s": busy["http"],
+            "subprocess_s": busy["exec"],
+            "local_s": max(0.0, wall - busy["any"]),
+            "http_calls": sum(row["count"] for row in endpoints if row["method"] != "EXEC"),
+            "subprocesses": sum(row["count"] for row in endpoints if row["method"] == "EXEC"),
+            "endpoints": endpoints,
+        }
+
+    def print_report(self, file=None):
+        """Prints the time split and the slowest endpoints by total time."""
+        file = file or sys.stderr
+        report = self.report()
+        wall = report["wall_s"] or 1e-9
+
+        def ms(seconds):
+            return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+        print("\n" + "=" * 80, file=file)
+        print("RUN PROFILE", file=file)
+        print("=" * 80, file=file)
+        print(f"Wall time:   {report['wall_s']:.2f}s", file=file)
+        for label, key in [
+            ("Network", "network_s"),
+            ("Subprocess", "subprocess_s"),
+            ("Local", "local_s"),
+        ]:
+            print(
+                f"{label + ':':<12} {report[key]:.2f}s ({report[key] / wall:.0%})",
+                file=file,
+            )
+        print(
+            f"HTTP calls:  {report['http_calls']}, subprocesses: {report['subprocesses']}",
+            file=file,
+        )
+        rows = report["endpoints"]
+        if rows:
+            header = (
+                f"{'Method':<7} {'Endpoint':<60} {'Count':>7} {'Errors':>6} {'Total s':>9} "
+                f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'MB in':>8} {'MB out':>8}"
+            )
+            print("\n" + header, file=file)
+            print("-" * len(header), file=file)
+            for row in rows[:REPORT_ROWS]:
+                endpoint = row["endpoint"]
+                if len(endpoint) > 60:
+                    endpoint = "..." + endpoint[-57:]
+                print(
+                    f"{row['method']:<7} {endpoint:<60} {row['count']:>7} {row['errors']:>6} "
+                    f"{row['total']:>9.2f} {ms(row['p50']):>9} {ms(row['p95']):>9} "
+                    f"{ms(row['p99']):>9} {row['bytes_received'] / 1048576:>8.2f} "
+                    f"{row['bytes_sent'] / 1048576:>8.2f}",
+                    file=file,
+                )
+            if len(rows) > REPORT_ROWS:
+                print(f"... {len(rows) - REPORT_ROWS} more endpoints", file=file)
+        if self.json_path:
+            print(f"\nProfile written to {self.json_path}", file=file)
+
+    def write_json(self, path=None):
+        with open(path or self.json_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+def _report_at_exit():
+    profile = _active
+    if profile is None:
+        return
+    if profile.json_path:
+        try:
+            profile.write_json()
+        except OSError as e:
+            print(f"Failed to write the profile to {profile.json_path}: {e}", file=sys.stderr)
+            profile.json_path = None
+    profile.print_report()
+
+
+def enable(json_path=None):
+    """
+    Starts recording the run profile, printed (and written to json_path, if
+    given) when the interpreter exits. Returns the RunProfile.
+    """
+    global _active
+    if _active is None:
+        _active = RunProfile(json_path)
+        atexit.register(_report_at_exit)
+    elif json_path:
+        _active.json_path = json_path
+    return _active
+
+
+def configure(enabled=False, json_path=None):
+    """
+    Enables the run profile when asked to, or when the JFROG_PROFILE (any
+    value but "0") or JFROG_PROFILE_JSON environment variables are set.
+    Returns the RunProfile, or None when profiling stays off.
+    """
+    json_path = json_path or os.environ.get("JFROG_PROFILE_JSON")
+    if enabled or json_path or os.environ.get("JFROG_PROFILE", "0") not in ("", "0"):
+        return enable(json_path)
+    return None
+
+
+def run(args, endpoint=None, **kwargs):
+    """
+    subprocess.run, recorded in the run profile (when enabled) under the
+    "EXEC" method and endpoint, by default the program name. A non-zero exit
+    code counts as an error, and the exit code is recorded as the status.
+    """
+    profile = _active
+    if profile is None:
+        return subprocess.run(args, **kwargs)
+    if endpoint is None:
+        endpoint = os.path.basename(args[0] if isinstance(args, (list, tuple)) else args.split()[0])
+    returncode = None
+    started = time.perf_counter()
+    profile.begin("exec")
+    try:
+        result = subprocess.run(args, **kwargs)
+        returncode = result.returncode
+        return result
+    except subprocess.CalledProcessError as e:
+        returncode = e.returncode
+        raise
+    finally:
+        profile.end(
+            "exec",
+            "EXEC",
+            endpoint,
+            time.perf_counter() - started,
+            returncode,
+            error=returncode != 0,
+        )
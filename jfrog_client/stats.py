@@ -0,0 +1,114 @@
+"""
+Per-endpoint latency histograms of the JFrog REST client and of the run
+profile (profiling.py).
+
+Latencies are counted in logarithmic buckets (5% wide), so memory stays
+constant however many requests a run makes, and percentiles are accurate to
+the bucket width.
+"""
+
+import math
+import threading
+
+BUCKET_GROWTH = 1.05  # Upper bound of a bucket / upper bound of the previous one
+MIN_LATENCY = 1e-4  # Seconds; faster requests fall in the first bucket
+
+
+class LatencyHistogram:
+    """Latency histogram of one endpoint."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.statuses = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def add(self, seconds, error=False, status=None, bytes_sent=None, bytes_received=None):
+        index = max(0, math.ceil(math.log(max(seconds, MIN_LATENCY) / MIN_LATENCY, BUCKET_GROWTH)))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.errors += bool(error)
+        self.total += seconds
+        # "-" counts the attempts that got no response
+        key = "-" if status is None else str(status)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self.bytes_sent += bytes_sent or 0
+        self.bytes_received += bytes_received or 0
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, fraction):
+        """Latency in seconds under which `fraction` of the requests completed."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(MIN_LATENCY * BUCKET_GROWTH**index, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "statuses": dict(self.statuses),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+
+class LatencyStats:
+    """
+    Thread-safe latency histograms keyed by (method, endpoint template), e.g.
+    ("GET", "artifactory/api/replications/{repo}"). One instance can be shared
+    by several clients to profile a whole run.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def record(
+        self,
+        method,
+        endpoint,
+        seconds,
+        status=None,
+        bytes_sent=None,
+        bytes_received=None,
+        error=None,
+    ):
+        """
+        Records one request. By default a missing status (no response) or a
+        status >= 400 counts as an error; subprocesses pass their own.
+        """
+        if error is None:
+            error = status is None or status >= 400
+        with self.lock:
+            histogram = self.histograms.get((method, endpoint))
+            if histogram is None:
+                histogram = self.histograms[(method, endpoint)] = LatencyHistogram()
+            histogram.add(seconds, error, status, bytes_sent, bytes_received)
+
+    def summary(self):
+        """Per-endpoint summaries, the endpoints taking the most total time first."""
+        with self.lock:
+            rows = [
+                dict(method=method, endpoint=endpoint, **histogram.summary())
+                for (method, endpoint), histogram in self.histograms.items()
+            ]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
@@ -0,0 +1,558 @@
+"""
+Per-ecosystem adapters of the GitHub Packages migration. Each adapter lists
+the versions of a package, fetches the files of a version and maps them to
+paths in the target Artifactory repository; migrator.py runs the pipeline.
+"""
+
+import base64
+import json
+import os
+import re
+import requests
+from urllib.parse import quote, urljoin
+
+from migrator import (
+    GITHUB_ORG,
+    GITHUB_PAT,
+    JFROG_URL,
+    UPLOAD_METHOD,
+    artifactory,
+    call_artifactory_api,
+    compute_file_checksums,
+    download_file,
+    get_package_versions_from_github,
+    registry_session,
+    upload_file,
+)
+# Importable once migrator has put the repository root on sys.path
+from jfrog_client import profiling
+
+# --- Configuration ---
+NPM_SCOPE = os.environ.get("NPM_SCOPE")  # The npm scope for your packages
+NPM_REGISTRY_URL = os.environ.get("NPM_REGISTRY_URL", "https://npm.pkg.github.com")
+DOWNLOAD_METHOD = os.environ.get("DOWNLOAD_METHOD", "native")  # "native" or "npm"
+MAVEN_REGISTRY_URL = os.environ.get("MAVEN_REGISTRY_URL", "https://maven.pkg.github.com")
+NUGET_REGISTRY_URL = os.environ.get("NUGET_REGISTRY_URL", "https://nuget.pkg.github.com")
+CONTAINER_REGISTRY_URL = os.environ.get("CONTAINER_REGISTRY_URL", "https://ghcr.io")
+
+# The Maven and NuGet registries take the PAT as the password of basic auth
+GITHUB_BASIC_AUTH_HEADERS = {
+    "Authorization": "Basic "
+    + base64.b64encode(f"{GITHUB_ORG}:{GITHUB_PAT}".encode()).decode()
+}
+
+
+def semver_key(version):
+    """
+    Sort key of a (loosely) semantic version: numeric release parts, then
+    prereleases before their release, with numeric identifiers before
+    alphanumeric ones. Build metadata is ignored.
+    """
+    release, _, prerelease = version.split("+", 1)[0].partition("-")
+    release_parts = tuple(
+        int(re.match(r"\d*", part).group() or 0) for part in release.split(".")
+    )
+    prerelease_parts = tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in prerelease.split(".")
+        if prerelease
+    )
+    return release_parts, 0 if prerelease else 1, prerelease_parts
+
+
+class PackageAdapter:
+    """
+    Base adapter: lists versions through the GitHub Packages API and deploys
+    every fetched file to "<repo>/<target_path>". Subclasses set the GitHub
+    package_type and implement fetch() and inventory_key().
+    """
+
+    package_type = None
+    inventory_pattern = "*"  # AQL name pattern of the migrated artifacts
+    # Upload order of the versions of a package, None keeps the discovery order
+    version_key = staticmethod(semver_key)
+
+    def __init__(self, repo):
+        self.repo = repo
+
+    def display_name(self, package_name):
+        return package_name
+
+    def filter_packages(self, packages):
+        return packages
+
+    def list_versions(self, package):
+        """Returns the (version, metadata) pairs of a GitHub package."""
+        versions = get_package_versions_from_github(self.package_type, package["name"])
+        return [(v["name"], None) for v in versions if v.get("name")]
+
+    def fetch(self, package_name, version, metadata, download_dir):
+        """
+        Downloads the files of a version into download_dir. Returns a list of
+        {"path", "target_path", "checksums"} dicts, the main artifact first.
+        """
+        raise NotImplementedError
+
+    def upload(self, package_name, version, files):
+        """Deploys the files of a version. Returns the sha1 of the main artifact."""
+        for f in files:
+            upload_file(f["path"], f"{self.repo}/{f['target_path']}", f["checksums"])
+        return files[0]["checksums"]["sha1"]
+
+    def inventory_key(self, item):
+        """Maps an AQL item of the target repository to "package@version", or None."""
+        raise NotImplementedError
+
+    def finalize_package(self, package_name):
+        """Called once after the last version of a package is uploaded."""
+
+    def finalize(self, uploaded):
+        """Called once at the end of a run that uploaded something."""
+
+
+class NpmAdapter(PackageAdapter):
+    """
+    npm packages: tarballs streamed from the packument's dist.tarball and
+    checked against dist.integrity, with 'npm pack' as the fallback.
+    """
+
+    package_type = "npm"
+    inventory_pattern = "*.tgz"
+    registry_headers = {
+        "Accept": "application/json",
+        "Authorization": f"Bearer {GITHUB_PAT}",
+    }
+
+    def display_name(self, package_name):
+        return f"{NPM_SCOPE}/{package_name}"
+
+    def list_versions(self, package):
+        versions = super().list_versions(package)
+        packument = {}
+        if DOWNLOAD_METHOD != "npm":
+            # One packument per package gives the tarball URL and integrity of every version
+            try:
+                packument = self.get_packument(package["name"])
+            except Exception as e:
+                print(f"Failed to get packument for {package['name']}, using npm pack: {e}")
+        return [
+            (version, packument.get(version, {}).get("dist"))
+            for version, _ in versions
+        ]
+
+    def get_packument(self, package_name):
+        """
+        Fetches the packument (registry metadata of all versions) of a package
+        from the GitHub npm registry. Returns the "versions" mapping.
+        """
+        packument_url = (
+            f"{NPM_REGISTRY_URL}/{quote(f'{NPM_SCOPE}/{package_name}', safe='@')}"
+        )
+        response = registry_session.get(
+            packument_url, headers=self.registry_headers, endpoint="npm/{package}"
+        )
+        response.raise_for_status()
+        return response.json().get("versions", {})
+
+    @staticmethod
+    def verify_integrity(dist, checksums):
+        """
+        Checks computed checksums against the dist.integrity (SRI) and dist.shasum
+        fields of a packument version. Raises ValueError on a mismatch.
+        """
+        computed = {
+            algorithm: base64.b64encode(bytes.fromhex(checksums[algorithm])).decode()
+            for algorithm in ("sha1", "sha512")
+        }
+        for entry in (dist.get("integrity") or "").split():
+            algorithm, _, expected = entry.partition("-")
+            if algorithm in computed and computed[algorithm] != expected:
+                raise ValueError(f"{algorithm} integrity mismatch")
+        if dist.get("shasum") and dist["shasum"] != checksums["sha1"]:
+            raise ValueError("shasum mismatch")
+
+    def fetch(self, package_name, version, dist, download_dir):
+        """
+        Downloads a package version from the registry directly when its packument
+        entry is known, falling back to 'npm pack'.
+        """
+        print(f"    Downloading {NPM_SCOPE}/{package_name}@{version} to {download_dir}...")
+        target_path = f"{NPM_SCOPE}/{package_name}/{version}/{package_name}-{version}.tgz"
+        if DOWNLOAD_METHOD != "npm" and dist and dist.get("tarball"):
+            # Same file name as npm pack, e.g. scope-package-1.0.0.tgz
+            tarball_path = os.path.join(
+                download_dir, f"{NPM_SCOPE.replace('@', '')}-{package_name}-{version}.tgz"
+            )
+            try:
+                checksums = download_file(
+                    dist["tarball"],
+                    tarball_path,
+                    self.registry_headers,
+                    verify=lambda checksums: self.verify_integrity(dist, checksums),
+                    endpoint="npm/{package}/-/{tarball}",
+                )
+                return [
+                    {"path": tarball_path, "target_path": target_path, "checksums": checksums}
+                ]
+            except Exception as e:
+                print(
+                    f"        Direct download of {package_name}@{version} failed ({e}), falling back to npm pack"
+                )
+        # npm pack verifies the integrity itself, the checksums take one more read
+        tarball_path = self.npm_pack(package_name, version, download_dir)
+        return [
+            {
+                "path": tarball_path,
+                "target_path": target_path,
+                "checksums": compute_file_checksums(tarball_path),
+            }
+        ]
+
+    def npm_pack(self, package_name, version, download_path):
+        """
+        Downloads a specific version of an npm package using 'npm pack'.
+        Returns the path to the created tarball.
+        """
+        # Every job runs in its own directory (passed as cwd), so downloads can run in parallel
+        os.makedirs(download_path, exist_ok=True)
+
+        # Configure npm to use GitHub Packages registry for the specific scope
+        # This is crucial for npm pack to find the package.
+        npmrc_content = f"@{GITHUB_ORG}:registry=https://npm.pkg.github.com/{GITHUB_ORG}\n//npm.pkg.github.com/:_authToken={GITHUB_PAT}"
+        with open(os.path.join(download_path, ".npmrc"), "w") as f:
+            f.write(npmrc_content)
+
+        npm_pack_command = ["npm", "pack", f"{NPM_SCOPE}/{package_name}@{version}"]
+        print(f"        npm pack command: {' '.join(npm_pack_command)}")
+
+        # Clean up existing tarballs before packing to avoid confusion
+        for f in os.listdir(download_path):
+            if f.endswith(".tgz"):
+                print(f"        Removing existing tarball: {os.path.join(download_path, f)}")
+                os.remove(os.path.join(download_path, f))
+
+        result = profiling.run(
+            npm_pack_command,
+            endpoint="npm pack",
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=download_path,
+        )
+        print(f"        npm pack Output: {result.stdout.strip()}")
+        if result.stderr:
+            # Filter out deprecation warnings to reduce noise
+            stderr_lines = result.stderr.split("\n")
+            filtered_stderr = [
+                line
+                for line in stderr_lines
+                if not (
+                    "npm warn Unknown user config" in line
+                    and ("email" in line or "always-auth" in line)
+                )
+            ]
+            filtered_stderr_text = "\n".join(filtered_stderr).strip()
+            if filtered_stderr_text:
+                print("        npm pack Error Output (if any):")
+                print(filtered_stderr_text)
+
+        # Find the generated tarball
+        tarball_name = ""
+        for f in os.listdir(download_path):
+            if f.endswith(".tgz"):
+                tarball_name = f
+                break
+
+        if not tarball_name:
+            raise FileNotFoundError(f"Could not find tarball for {package_name}@{version}")
+
+        return os.path.join(download_path, tarball_name)
+
+    def finalize(self, uploaded):
+        """
+        Recalculates the npm metadata of the repository once, after every
+        package's versions were deployed in version order. Artifactory has no
+        per-package npm reindex, so this is one call per run.
+        """
+        print(f"Recalculating the npm metadata of {self.repo}...")
+        call_artifactory_api("POST", f"api/npm/{self.repo}/reindex")
+
+    def inventory_key(self, item):
+        """
+        Recognizes the layout this script uploads (<scope>/<package>/<version>/<file>.tgz)
+        and the npm publish layout (<scope>/<package>/-/<scope>/<package>-<version>.tgz).
+        """
+        parts = item.get("path", "").split("/")
+        name = item.get("name", "")
+        if len(parts) == 3 and parts[0] == NPM_SCOPE:
+            return f"{parts[1]}@{parts[2]}"
+        if len(parts) == 4 and parts[0] == NPM_SCOPE and parts[2] == "-":
+            prefix = f"{parts[1]}-"
+            if name.startswith(prefix) and name.endswith(".tgz"):
+                return f"{parts[1]}@{name[len(prefix):-len('.tgz')]}"
+        return None
+
+
+class MavenAdapter(PackageAdapter):
+    """
+    Maven packages: the POM, the main artifact named by its <packaging> and
+    the sources/javadoc jars when published. GitHub names a Maven package
+    "<groupId>.<artifactId>" and serves it from the repository it belongs to.
+    """
+
+    package_type = "maven"
+    inventory_pattern = "*.pom"
+    # <packaging> values whose main artifact is not a file of that extension
+    packaging_extensions = {"pom": None, "bundle": "jar", "maven-plugin": "jar"}
+
+    def list_versions(self, package):
+        repository = (package.get("repository") or {}).get("name")
+        return [
+            (version, {"repository": repository})
+            for version, _ in super().list_versions(package)
+        ]
+
+    def fetch(self, package_name, version, metadata, download_dir):
+        print(f"    Downloading {package_name}@{version} to {download_dir}...")
+        group_id, artifact_id = package_name.rsplit(".", 1)
+        version_path = f"{group_id.replace('.', '/')}/{artifact_id}/{version}"
+        base_url = f"{MAVEN_REGISTRY_URL}/{GITHUB_ORG}/{metadata['repository']}/{version_path}"
+
+        def fetch_file(file_name):
+            path = os.path.join(download_dir, file_name)
+            checksums = download_file(
+                f"{base_url}/{file_name}",
+                path,
+                GITHUB_BASIC_AUTH_HEADERS,
+                endpoint="maven/{owner}/{repository}/{path:path}",
+            )
+            return {
+                "path": path,
+                "target_path": f"{version_path}/{file_name}",
+                "checksums": checksums,
+            }
+
+        pom = fetch_file(f"{artifact_id}-{version}.pom")
+        files = [pom]
+        with open(pom["path"], encoding="utf-8", errors="replace") as f:
+            packaging = re.search(r"<packaging>\s*([\w.-]+)\s*</packaging>", f.read())
+        packaging = packaging.group(1) if packaging else "jar"
+        extension = self.packaging_extensions.get(packaging, packaging)
+
+        optional = [f"{artifact_id}-{version}-sources.jar", f"{artifact_id}-{version}-javadoc.jar"]
+        if extension:
+            optional.insert(0, f"{artifact_id}-{version}.{extension}")
+        for file_name in optional:
+            try:
+                files.append(fetch_file(file_name))
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code != 404:
+                    raise
+        return files
+
+    def finalize_package(self, package_name):
+        """Calculates the maven-metadata.xml of the package once, after all its versions."""
+        group_id, artifact_id = package_name.rsplit(".", 1)
+        call_artifactory_api(
+            "POST",
+            f"api/maven/calculateMetadata/{self.repo}/{group_id.replace('.', '/')}/{artifact_id}",
+        )
+
+    def inventory_key(self, item):
+        """<group path>/<artifactId>/<version>/<artifactId>-<version>.pom"""
+        parts = item.get("path", "").split("/")
+        if len(parts) < 3:
+            return None
+        return f"{'.'.join(parts[:-1])}@{parts[-1]}"
+
+
+class NugetAdapter(PackageAdapter):
+    """NuGet packages: the .nupkg of each version, deployed as <id>/<id>.<version>.nupkg."""
+
+    package_type = "nuget"
+    inventory_pattern = "*.nupkg"
+
+    def fetch(self, package_name, version, metadata, download_dir):
+        print(f"    Downloading {package_name}@{version} to {download_dir}...")
+        # The NuGet v3 flat container uses lowercase ids and versions
+        lower_id, lower_version = package_name.lower(), version.lower()
+        url = f"{NUGET_REGISTRY_URL}/{GITHUB_ORG}/download/{lower_id}/{lower_version}/{lower_id}.{lower_version}.nupkg"
+        file_name = f"{package_name}.{version}.nupkg"
+        path = os.path.join(download_dir, file_name)
+        checksums = download_file(
+            url,
+            path,
+            GITHUB_BASIC_AUTH_HEADERS,
+            endpoint="nuget/{owner}/download/{id}/{version}/{file}",
+        )
+        return [
+            {
+                "path": path,
+                "target_path": f"{package_name}/{file_name}",
+                "checksums": checksums,
+            }
+        ]
+
+    def inventory_key(self, item):
+        path, name = item.get("path", ""), item.get("name", "")
+        prefix = f"{path}."
+        if name.startswith(prefix) and name.endswith(".nupkg"):
+            return f"{path}@{name[len(prefix):-len('.nupkg')]}"
+        return None
+
+
+class ContainerAdapter(PackageAdapter):
+    """
+    Container images from ghcr.io, copied manifest by manifest and blob by
+    blob into an Artifactory Docker repository through its Docker Registry
+    API. GitHub versions are manifest digests; untagged ones are skipped and
+    only migrated as children of a tagged multi-platform index.
+    """
+
+    package_type = "container"
+    inventory_pattern = "*manifest.json"
+    version_key = None  # Versions are digests
+    manifest_types = ", ".join(
+        [
+            "application/vnd.oci.image.index.v1+json",
+            "application/vnd.docker.distribution.manifest.list.v2+json",
+            "application/vnd.oci.image.manifest.v1+json",
+            "application/vnd.docker.distribution.manifest.v2+json",
+        ]
+    )
+
+    def list_versions(self, package):
+        versions = get_package_versions_from_github(self.package_type, package["name"])
+        return [
+            (v["name"], {"tags": v["metadata"]["container"]["tags"]})
+            for v in versions
+            if (v.get("metadata") or {}).get("container", {}).get("tags")
+        ]
+
+    def registry_headers(self, image):
+        response = registry_session.get(
+            f"{CONTAINER_REGISTRY_URL}/token",
+            params={"scope": f"repository:{image}:pull"},
+            auth=(GITHUB_ORG, GITHUB_PAT),
+        )
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['token']}"}
+
+    @staticmethod
+    def verify_digest(digest):
+        def verify(checksums):
+            algorithm, _, expected = digest.partition(":")
+            if checksums.get(algorithm) != expected:
+                raise ValueError(f"digest mismatch for {digest}")
+
+        return verify
+
+    def fetch(self, package_name, version, metadata, download_dir):
+        print(f"    Downloading {package_name}@{version} to {download_dir}...")
+        image = f"{GITHUB_ORG.lower()}/{package_name}"
+        headers = self.registry_headers(image)
+        files = []
+        fetched = set()
+
+        def fetch_blob(digest):
+            if digest in fetched:
+                return
+            fetched.add(digest)
+            path = os.path.join(download_dir, "blobs", digest.replace(":", "_"))
+            checksums = download_file(
+                f"{CONTAINER_REGISTRY_URL}/v2/{image}/blobs/{digest}",
+                path,
+                headers,
+                verify=self.verify_digest(digest),
+            )
+            files.append({"path": path, "target_path": None, "checksums": checksums, "digest": digest})
+
+        def fetch_manifest(digest):
+            path = os.path.join(download_dir, "manifests", digest.replace(":", "_"))
+            checksums = download_file(
+                f"{CONTAINER_REGISTRY_URL}/v2/{image}/manifests/{digest}",
+                path,
+                dict(headers, Accept=self.manifest_types),
+                verify=self.verify_digest(digest),
+            )
+            with open(path) as f:
+                manifest = json.load(f)
+            # Children and blobs first, so every file is uploaded after its references
+            for child in manifest.get("manifests", []):
+                fetch_manifest(child["digest"])
+            for blob in [manifest.get("config")] + manifest.get("layers", []):
+                if blob:
+                    fetch_blob(blob["digest"])
+            media_type = manifest.get("mediaType") or (
+                "application/vnd.oci.image.index.v1+json"
+                if "manifests" in manifest
+                else "application/vnd.oci.image.manifest.v1+json"
+            )
+            files.append(
+                {
+                    "path": path,
+                    "target_path": None,
+                    "checksums": checksums,
+                    "digest": digest,
+                    "media_type": media_type,
+                    "tags": metadata["tags"] if digest == version else [],
+                }
+            )
+
+        fetch_manifest(version)
+        # The main artifact (the tagged manifest) comes first
+        return files[::-1]
+
+    def upload(self, package_name, version, files):
+        if UPLOAD_METHOD != "native" or artifactory is None:
+            raise ValueError("container images need JFROG_URL and ARTIFACTORY_TOKEN")
+        base_url = f"{JFROG_URL.rstrip('/')}/artifactory/api/docker/{self.repo}/v2/{package_name}"
+        for f in reversed(files):
+            if "media_type" not in f:
+                self.push_blob(base_url, f)
+                continue
+            with open(f["path"], "rb") as manifest:
+                body = manifest.read()
+            for reference in f["tags"] or [f["digest"]]:
+                response = artifactory.put(
+                    f"{base_url}/manifests/{reference}",
+                    headers={"Content-Type": f["media_type"]},
+                    data=body,
+                )
+                response.raise_for_status()
+        return files[0]["checksums"]["sha1"]
+
+    @staticmethod
+    def push_blob(base_url, blob):
+        """Pushes a blob with a monolithic upload, unless the registry has it."""
+        digest = blob["digest"]
+        response = artifactory.head(f"{base_url}/blobs/{digest}")
+        if response.status_code == 200:
+            return
+        response = artifactory.post(f"{base_url}/blobs/uploads/")
+        response.raise_for_status()
+        location = urljoin(base_url, response.headers["Location"])
+        separator = "&" if "?" in location else "?"
+        with open(blob["path"], "rb") as f:
+            response = artifactory.put(
+                f"{location}{separator}digest={digest}",
+                headers={"Content-Type": "application/octet-stream"},
+                data=f,
+            )
+        response.raise_for_status()
+
+    def inventory_key(self, item):
+        """<image>/<tag>/manifest.json, whose sha256 is the manifest digest."""
+        path, sha256 = item.get("path", ""), item.get("sha256")
+        if "/" not in path or not sha256:
+            return None
+        return f"{path.rsplit('/', 1)[0]}@sha256:{sha256}"
+
+
+ADAPTERS = {
+    "npm": NpmAdapter,
+    "maven": MavenAdapter,
+    "nuget": NugetAdapter,
+    "container": ContainerAdapter,
+    "docker": ContainerAdapter,
+}
@@ -0,0 +1,54 @@
+import argparse
+import os
+
+from adapters import ADAPTERS
+from migrator import profiling, run_migration
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Migrate packages from GitHub Packages to JFrog Artifactory."
+    )
+    parser.add_argument(
+        "--package_type",
+        choices=sorted(ADAPTERS),
+        default=os.environ.get("PACKAGE_TYPE", "npm"),
+        help="Ecosystem to migrate (default: PACKAGE_TYPE or npm)",
+    )
+    parser.add_argument(
+        "--repo",
+        help="Target Artifactory repository (default: JFROG_REPO, or JFROG_<TYPE>_REPO, e.g. JFROG_NPM_REPO)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the run recorded in the state database instead of discovering packages again",
+    )
+    parser.add_argument(
+        "--state_db",
+        default=os.environ.get("STATE_DB"),
+        help="SQLite file tracking the run (default: STATE_DB or <package_type>_migration_state.db)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the latency of every endpoint and subprocess at exit (also JFROG_PROFILE=1)",
+    )
+    parser.add_argument(
+        "--profile_json",
+        help="Also write the run profile to this JSON file (also JFROG_PROFILE_JSON)",
+    )
+    args = parser.parse_args(argv)
+    profiling.configure(args.profile, args.profile_json)
+
+    repo = (
+        args.repo
+        or os.environ.get("JFROG_REPO")
+        or os.environ.get(f"JFROG_{args.package_type.upper()}_REPO")
+    )
+    adapter = ADAPTERS[args.package_type](repo)
+    run_migration(adapter, resume=args.resume, state_db=args.state_db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1139 @@
+"""
+Ecosystem-independent core of the GitHub Packages to JFrog Artifactory
+migration: GitHub enumeration, the download/upload pipeline, checksums,
+the target repository inventory and the resumable state store. The
+per-ecosystem parts live in adapters.py.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import queue
+import requests
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from itertools import groupby, zip_longest
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tabulate import tabulate
+from urllib.parse import parse_qs, quote, urlparse
+
+# The shared JFrog REST client lives at the root of the repository
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+)
+from jfrog_client import JFrogClient, profiling  # noqa: E402
+
+# --- Configuration ---
+GITHUB_ORG = os.environ.get("GITHUB_ORG")  # GitHub organization/user name
+GITHUB_ORG_TYPE = os.environ.get("GITHUB_ORG_TYPE", "orgs")  # Default to "orgs"
+GITHUB_PAT = os.environ.get("GITHUB_PAT")  # Get PAT from environment variable
+# GitHub REST API root, e.g. https://github.example.com/api/v3 for GitHub Enterprise Server
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+MAX_WORKERS = int(os.environ.get("MAX_WORKERS", "8"))  # Concurrent API calls/downloads
+UPLOAD_WORKERS = int(os.environ.get("UPLOAD_WORKERS", "4"))  # Concurrent uploads
+# Downloaded versions waiting for an uploader; downloads pause when it is full
+UPLOAD_QUEUE_SIZE = int(os.environ.get("UPLOAD_QUEUE_SIZE", str(MAX_WORKERS * 2)))
+KEEP_DOWNLOADS = os.environ.get("KEEP_DOWNLOADS", "false").lower() == "true"
+JFROG_URL = os.environ.get("JFROG_URL")  # e.g. https://mycompany.jfrog.io
+ARTIFACTORY_TOKEN = os.environ.get("ARTIFACTORY_TOKEN")  # JFrog access token
+# "native" deploys over HTTP, "jfrog" shells out to the JFrog CLI
+UPLOAD_METHOD = os.environ.get(
+    "UPLOAD_METHOD", "native" if JFROG_URL and ARTIFACTORY_TOKEN else "jfrog"
+)
+# Skip versions already present in the target repository (pre-flight AQL inventory)
+SKIP_EXISTING = os.environ.get("SKIP_EXISTING", "true").lower() == "true"
+AQL_PAGE_SIZE = int(os.environ.get("AQL_PAGE_SIZE", "10000"))  # Items per AQL page
+STATE_BATCH_SIZE = int(os.environ.get("STATE_BATCH_SIZE", "50"))  # State writes per commit
+
+GITHUB_API_HEADERS = {
+    "Accept": "application/vnd.github.v3+json",
+    "Authorization": f"token {GITHUB_PAT}",
+}
+
+# Endpoints with names in their path, labelled by template in the latency statistics
+GITHUB_ENDPOINTS = [
+    "{owner_type}/{owner}/packages",
+    "{owner_type}/{owner}/packages/{package_type}/{package}/versions",
+    "v2/{image:path}/blobs/{digest}",
+    "v2/{image:path}/manifests/{reference}",
+]
+ARTIFACTORY_ENDPOINTS = [
+    "artifactory/api/docker/{repo}/v2/{image:path}/blobs/uploads/{uuid}",
+    "artifactory/api/docker/{repo}/v2/{image:path}/blobs/uploads/",
+    "artifactory/api/docker/{repo}/v2/{image:path}/blobs/{digest}",
+    "artifactory/api/docker/{repo}/v2/{image:path}/manifests/{reference}",
+]
+
+# Pooled client shared by the GitHub REST API calls of every worker. GitHub
+# rate limits (403/429) are left to the rate limiter; 5xx answers are retried.
+http_session = JFrogClient(
+    GITHUB_API_URL,
+    pool_size=max(MAX_WORKERS, UPLOAD_WORKERS),
+    retry_statuses=(500, 502, 503, 504),
+    endpoints=GITHUB_ENDPOINTS,
+)
+# Pooled client for the package registry downloads, which are not paced by the
+# rate limiter and so retry 429 answers after their Retry-After themselves
+registry_session = JFrogClient(
+    pool_size=max(MAX_WORKERS, UPLOAD_WORKERS),
+    endpoints=GITHUB_ENDPOINTS,
+    stats=http_session.stats,
+)
+# Pooled client for the Artifactory REST and deploy APIs, recording into the same statistics
+artifactory = (
+    JFrogClient(
+        JFROG_URL,
+        token=ARTIFACTORY_TOKEN,
+        pool_size=max(MAX_WORKERS, UPLOAD_WORKERS),
+        endpoints=ARTIFACTORY_ENDPOINTS,
+        stats=http_session.stats,
+    )
+    if JFROG_URL and ARTIFACTORY_TOKEN
+    else None
+)
+
+
+class GitHubRateLimiter:
+    """
+    Paces GitHub REST API calls against the X-RateLimit-* headers of the
+    responses: no more requests are in flight than the remaining quota, and
+    every caller sleeps until the reset (or Retry-After of a secondary rate
+    limit) instead of failing.
+    """
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.paused_until = 0.0
+        # Set once a response came without rate limit headers (e.g. GHES with
+        # rate limiting disabled): the quota is then unlimited
+        self.unlimited = False
+
+    def acquire(self):
+        with self.condition:
+            while True:
+                now = time.time()
+                if self.paused_until > now:
+                    self.condition.wait(self.paused_until - now)
+                    continue
+                if self.remaining is not None and self.remaining - self.in_flight <= 0:
+                    if self.reset_at and self.reset_at > now:
+                        if self.in_flight == 0:
+                            self.pause_until(self.reset_at + 1, "rate limit exhausted")
+                        else:
+                            self.condition.wait()
+                        continue
+                    # The window has reset, the next response brings the new quota
+                    self.remaining = None
+                # Until a response brings the quota, a single request probes it
+                known = self.remaining is not None or self.unlimited
+                concurrency = self.max_concurrency if known else 1
+                if self.in_flight >= concurrency:
+                    self.condition.wait()
+                    continue
+                self.in_flight += 1
+                return
+
+    def release(self, response):
+        with self.condition:
+            self.in_flight -= 1
+            # Proxy or server errors may lack the headers even when GitHub limits the rate
+            if response is not None and (
+                response.status_code < 500 or "X-RateLimit-Remaining" in response.headers
+            ):
+                self.update(response.headers)
+            self.condition.notify_all()
+
+    def update(self, headers):
+        if "X-RateLimit-Remaining" not in headers:
+            self.unlimited = True
+            return
+        self.unlimited = False
+        reset_at = float(headers.get("X-RateLimit-Reset", 0))
+        remaining = int(headers["X-RateLimit-Remaining"])
+        # Responses arrive out of order; keep the lowest count of the newest window
+        if self.reset_at is None or reset_at > self.reset_at:
+            self.remaining = remaining
+        elif reset_at == self.reset_at:
+            self.remaining = min(remaining, self.remaining if self.remaining is not None else remaining)
+        else:
+            return
+        self.reset_at = reset_at
+        self.limit = int(headers.get("X-RateLimit-Limit", 0)) or self.limit
+
+    def pause_until(self, until, reason):
+        """Holds every caller until the given epoch time. Caller holds the lock."""
+        if until > self.paused_until:
+            self.paused_until = until
+            print(
+                f"GitHub {reason}, sleeping {until - time.time():.0f}s until {time.strftime('%H:%M:%S', time.localtime(until))}..."
+            )
+
+    def backoff(self, response):
+        """
+        Returns True when the response is a primary or secondary rate limit
+        and pauses all callers until it is lifted.
+        """
+        if response.status_code not in (403, 429):
+            return False
+        with self.condition:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                self.pause_until(time.time() + int(retry_after), "secondary rate limit")
+            elif response.headers.get("X-RateLimit-Remaining") == "0":
+                self.pause_until(
+                    float(response.headers.get("X-RateLimit-Reset", time.time() + 60)) + 1,
+                    "rate limit exhausted",
+                )
+            elif "secondary rate limit" in response.text.lower():
+                # GitHub asks to wait at least one minute when no Retry-After is sent
+                self.pause_until(time.time() + 60, "secondary rate limit")
+            else:
+                return False
+            self.condition.notify_all()
+            return True
+
+    def status(self):
+        with self.condition:
+            if self.remaining is None:
+                return "GitHub quota unlimited" if self.unlimited else "GitHub quota unknown"
+            resets_in = max(0, (self.reset_at or 0) - time.time())
+            return f"GitHub quota {self.remaining}/{self.limit} remaining, resets in {resets_in / 60:.0f}m"
+
+    def eta(self, started, done, total, requests_per_item=1):
+        """Estimates the seconds left, including waits for quota resets."""
+        if not done:
+            return None
+        left = total - done
+        eta = (time.time() - started) / done * left
+        with self.condition:
+            if self.remaining is not None and self.limit:
+                needed = left * requests_per_item - self.remaining
+                if needed > 0:
+                    # Each extra full window costs the time until its reset
+                    windows = -(-needed // self.limit)
+                    eta = max(eta, (self.reset_at - time.time()) + (windows - 1) * 3600)
+        return eta
+
+
+github_rate_limiter = GitHubRateLimiter(MAX_WORKERS)
+
+
+def github_get(url, **kwargs):
+    """
+    GET on the GitHub REST API through the rate limiter, retried after the
+    limiter's sleep when GitHub answers with a rate limit.
+    """
+    kwargs.setdefault("headers", GITHUB_API_HEADERS)
+    while True:
+        github_rate_limiter.acquire()
+        response = None
+        try:
+            response = http_session.get(url, **kwargs)
+        finally:
+            github_rate_limiter.release(response)
+        if not github_rate_limiter.backoff(response):
+            return response
+
+
+GITHUB_PER_PAGE = 100  # Maximum page size of the GitHub REST API
+
+
+def get_github_pages(url):
+    """
+    Fetches every page of a paginated GitHub REST API list endpoint.
+    The first page's Link header gives the last page number; the remaining
+    pages are then fetched concurrently. Falls back to following rel="next"
+    when no rel="last" link is returned.
+    """
+    params = {"per_page": GITHUB_PER_PAGE}
+    response = github_get(url, params=params)
+    response.raise_for_status()
+    items = response.json()
+
+    last = response.links.get("last")
+    if last:
+        last_page = int(parse_qs(urlparse(last["url"]).query)["page"][0])
+
+        def get_page(page):
+            page_response = github_get(url, params=dict(params, page=page))
+            page_response.raise_for_status()
+            return page_response.json()
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            for page_items in executor.map(get_page, range(2, last_page + 1)):
+                items.extend(page_items)
+        return items
+
+    while "next" in response.links:
+        response = github_get(response.links["next"]["url"])
+        response.raise_for_status()
+        items.extend(response.json())
+    return items
+
+
+def get_packages_from_github(package_type):
+    """Fetches the packages of the given type for the GitHub organization."""
+    print(f"Querying GitHub Packages for {package_type} packages of {GITHUB_ORG}...")
+    packages_url = f"{GITHUB_API_URL}/{GITHUB_ORG_TYPE}/{GITHUB_ORG}/packages?package_type={package_type}"
+    return get_github_pages(packages_url)
+
+
+def get_package_versions_from_github(package_type, package_name):
+    """Fetches all versions of a package from GitHub Packages."""
+    print(f"  Fetching versions for package: {package_name}...")
+    # Container names may contain "/", which the API expects URL-encoded
+    versions_url = f"{GITHUB_API_URL}/{GITHUB_ORG_TYPE}/{GITHUB_ORG}/packages/{package_type}/{quote(package_name, safe='')}/versions"
+    return get_github_pages(versions_url)
+
+
+CHECKSUM_ALGORITHMS = ("md5", "sha1", "sha256", "sha512")
+
+
+def new_checksum_hashes():
+    """Returns fresh hash objects for every checksum computed on a file."""
+    return {algorithm: hashlib.new(algorithm) for algorithm in CHECKSUM_ALGORITHMS}
+
+
+def checksum_digests(hashes):
+    """
+    Returns the hex digests of the hash objects, plus the sha512 in npm's
+    SRI form under "integrity".
+    """
+    checksums = {algorithm: h.hexdigest() for algorithm, h in hashes.items()}
+    checksums["integrity"] = (
+        "sha512-" + base64.b64encode(hashes["sha512"].digest()).decode()
+    )
+    return checksums
+
+
+def compute_file_checksums(file_path):
+    """
+    Computes all checksums of a file in a single read.
+    """
+    hashes = new_checksum_hashes()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            for h in hashes.values():
+                h.update(chunk)
+    return checksum_digests(hashes)
+
+
+def download_file(url, file_path, headers, verify=None, endpoint=None):
+    """
+    Streams a URL straight to disk, computing all checksums in the same pass.
+    The optional verify callback gets the checksums and raises to reject the
+    file before it is moved into place. The optional endpoint labels the
+    request in the statistics, for registry URLs matching no template.
+    Returns the checksums.
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    partial_path = f"{file_path}.part"
+    hashes = new_checksum_hashes()
+    try:
+        with registry_session.get(
+            url, headers=headers, stream=True, endpoint=endpoint
+        ) as response:
+            response.raise_for_status()
+            with open(partial_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+                    for h in hashes.values():
+                        h.update(chunk)
+        checksums = checksum_digests(hashes)
+        if verify:
+            verify(checksums)
+    except Exception:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    os.replace(partial_path, file_path)
+    return checksums
+
+
+# Deploys of identical content are serialized, so only the first one transfers it
+deploy_locks = {}
+deploy_locks_guard = threading.Lock()
+
+
+def verify_deployed_checksums(response, checksums):
+    """
+    Compares the checksums Artifactory reports for a deployed file with the
+    ones computed locally. Raises ValueError on a mismatch.
+    """
+    try:
+        deployed = response.json().get("checksums", {})
+    except ValueError:
+        return
+    for algorithm in ("md5", "sha1", "sha256"):
+        if deployed.get(algorithm) and deployed[algorithm] != checksums[algorithm]:
+            raise ValueError(
+                f"Artifactory {algorithm} {deployed[algorithm]} does not match {checksums[algorithm]}"
+            )
+
+
+def deploy_to_artifactory(file_path, target_path, checksums=None):
+    """
+    Deploys a file with the Artifactory deploy API over the pooled client.
+    A checksum deploy is tried first, so content already in the filestore is
+    not transferred again, and the checksums Artifactory returns are checked.
+    Uses the checksums computed at download time when given.
+    Returns ("checksum" or "upload", checksums).
+    """
+    repo, _, path = target_path.partition("/")
+    path_params = {"repo": repo, "path": path}
+    if checksums is None:
+        checksums = compute_file_checksums(file_path)
+    headers = {
+        "X-Checksum": checksums["md5"],
+        "X-Checksum-Sha1": checksums["sha1"],
+        "X-Checksum-Sha256": checksums["sha256"],
+    }
+
+    with deploy_locks_guard:
+        deploy_lock = deploy_locks.setdefault(checksums["sha1"], threading.Lock())
+    with deploy_lock:
+        response = artifactory.put(
+            "artifactory/{repo}/{path:path}",
+            path_params=path_params,
+            headers=dict(headers, **{"X-Checksum-Deploy": "true"}),
+        )
+        if response.status_code in (200, 201):
+            verify_deployed_checksums(response, checksums)
+            return "checksum", checksums
+        # Artifactory answers 404 when it does not have the checksum yet
+        if response.status_code != 404:
+            response.raise_for_status()
+
+        with open(file_path, "rb") as f:
+            response = artifactory.put(
+                "artifactory/{repo}/{path:path}",
+                path_params=path_params,
+                headers=headers,
+                data=f,
+            )
+        response.raise_for_status()
+        verify_deployed_checksums(response, checksums)
+    return "upload", checksums
+
+
+def upload_file(file_path, target_path, checksums=None):
+    """
+    Uploads a file to a "<repo>/<path>" target in JFrog Artifactory, with the
+    deploy API (UPLOAD_METHOD=native) or JFrog CLI's `jf rt upload`. Returns
+    the sha1 of the uploaded file; checksums computed at download time are reused.
+    """
+    if UPLOAD_METHOD == "native":
+        method, checksums = deploy_to_artifactory(file_path, target_path, checksums)
+        print(
+            f"        Deployed {target_path} ({'checksum deploy' if method == 'checksum' else 'full upload'})."
+        )
+        return checksums["sha1"]
+
+    upload_command = [
+        "jfrog",
+        "rt",
+        "upload",
+        file_path,
+        target_path,
+    ]
+
+    try:
+        # Set JFrog CLI output to warning level for this process only
+        print(f"Running command: {' '.join(upload_command)}")
+        result = profiling.run(
+            upload_command,
+            endpoint="jfrog rt upload",
+            check=True,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, JFROG_CLI_LOG_LEVEL="WARN"),
+        )
+        print("        JFrog CLI Output:")
+        print(result.stdout)
+        if result.stderr:
+            print("        JFrog CLI Error Output (if any):")
+            print(result.stderr)
+        return (checksums or compute_file_checksums(file_path))["sha1"]
+    except subprocess.CalledProcessError as e:
+        print(f"        Error uploading {file_path}:")
+        print(f"        Command: {' '.join(e.cmd)}")
+        print(f"        Return Code: {e.returncode}")
+        print(f"        STDOUT: {e.stdout}")
+        print(f"        STDERR: {e.stderr}")
+        raise
+
+
+def call_artifactory_api(method, api_path, data=None, content_type=None):
+    """
+    Calls an Artifactory REST API ("api/...") over the pooled client, or
+    through `jfrog rt curl` when no JFROG_URL/ARTIFACTORY_TOKEN is configured.
+    Returns the parsed JSON body, or the text when it is not JSON.
+    """
+    if artifactory is not None:
+        headers = {"Content-Type": content_type} if content_type else {}
+        response = artifactory.request(
+            method, f"artifactory/{api_path}", headers=headers, data=data
+        )
+        response.raise_for_status()
+        body = response.text
+    else:
+        command = ["jfrog", "rt", "curl", "-s", f"-X{method}", f"/{api_path}"]
+        if content_type:
+            command += ["-H", f"Content-Type: {content_type}"]
+        if data is not None:
+            command += ["-d", data]
+        result = profiling.run(
+            command,
+            endpoint="jfrog rt curl",
+            check=True,
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, JFROG_CLI_LOG_LEVEL="WARN"),
+        )
+        body = result.stdout
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+def run_aql(query):
+    """Runs an Artifactory AQL query. Returns the "results" list."""
+    return call_artifactory_api(
+        "POST", "api/search/aql", data=query, content_type="text/plain"
+    ).get("results", [])
+
+
+def iter_aql(query):
+    """
+    Yields the results of an AQL query (without offset/limit), fetched
+    AQL_PAGE_SIZE results at a time.
+    """
+    if artifactory is not None:
+        yield from artifactory.iter_aql(query, AQL_PAGE_SIZE)
+        return
+    offset = 0
+    while True:
+        results = run_aql(f"{query}.offset({offset}).limit({AQL_PAGE_SIZE})")
+        yield from results
+        if len(results) < AQL_PAGE_SIZE:
+            return
+        offset += AQL_PAGE_SIZE
+
+
+def get_migrated_versions(adapter):
+    """
+    Lists the artifacts already in the adapter's target repository with paged
+    AQL queries and returns a {"package@version": sha1} mapping.
+    """
+    print(f"Reading the inventory of {adapter.repo}...")
+    migrated = {}
+    query = (
+        f'items.find({{"repo":"{adapter.repo}","name":{{"$match":"{adapter.inventory_pattern}"}}}})'
+        '.include("path","name","sha1","sha256")'
+        '.sort({"$asc":["path","name"]})'
+    )
+    for item in iter_aql(query):
+        key = adapter.inventory_key(item)
+        if key:
+            migrated[key] = item.get("sha1")
+    print(f"Found {len(migrated)} versions already in {adapter.repo}.")
+    return migrated
+
+
+class MigrationState:
+    """
+    SQLite store of the migration state of every package@version:
+    discovered -> downloaded (files, integrity) -> uploaded (sha1).
+    Writes from the worker threads are buffered and committed in batches of
+    STATE_BATCH_SIZE, each batch in a single transaction.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS versions (
+            package TEXT NOT NULL,
+            version TEXT NOT NULL,
+            status TEXT NOT NULL,
+            download_dir TEXT,
+            metadata TEXT,
+            files TEXT,
+            integrity TEXT,
+            size INTEGER,
+            checksum TEXT,
+            error TEXT,
+            updated_at REAL,
+            PRIMARY KEY (package, version)
+        )
+    """
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(self.SCHEMA)
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.pending = []
+
+    def write(self, sql, params):
+        with self.lock:
+            self.pending.append((sql, params))
+            if len(self.pending) >= STATE_BATCH_SIZE:
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        if not self.pending:
+            return
+        with self.conn:
+            # Consecutive writes of the same kind go in one executemany
+            for sql, group in groupby(self.pending, key=lambda w: w[0]):
+                self.conn.executemany(sql, [params for _, params in group])
+        self.pending = []
+
+    def start_run(self, download_jobs):
+        """Replaces the stored state with the versions of a new run."""
+        with self.lock:
+            self.pending = []
+            with self.conn:
+                self.conn.execute("DELETE FROM versions")
+                self.conn.executemany(
+                    "INSERT INTO versions (package, version, status, download_dir, metadata, updated_at)"
+                    " VALUES (?, ?, 'discovered', ?, ?, ?)",
+                    [
+                        (package, version, download_dir, json.dumps(metadata), time.time())
+                        for package, version, download_dir, metadata in download_jobs
+                    ],
+                )
+
+    def pending_jobs(self):
+        """
+        Returns the download jobs of the versions not uploaded yet, in
+        discovery order, or None when no run is stored.
+        """
+        with self.lock:
+            if not self.conn.execute("SELECT 1 FROM versions LIMIT 1").fetchone():
+                return None
+            rows = self.conn.execute(
+                "SELECT package, version, download_dir, metadata FROM versions"
+                " WHERE status != 'uploaded' ORDER BY rowid"
+            ).fetchall()
+        return [
+            (package, version, download_dir, json.loads(metadata) if metadata else None)
+            for package, version, download_dir, metadata in rows
+        ]
+
+    def downloaded_files(self, package_name, version):
+        """Returns the files of a version downloaded by an earlier run, if still on disk."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT files FROM versions"
+                " WHERE package = ? AND version = ? AND status = 'downloaded'",
+                (package_name, version),
+            ).fetchone()
+        if not row or not row[0]:
+            return None
+        files = json.loads(row[0])
+        if all(os.path.exists(f["path"]) for f in files):
+            return files
+        return None
+
+    def mark_downloaded(self, package_name, version, files, size):
+        self.write(
+            "UPDATE versions SET status = 'downloaded', files = ?, integrity = ?,"
+            " size = ?, error = NULL, updated_at = ? WHERE package = ? AND version = ?",
+            (
+                json.dumps(files),
+                files[0]["checksums"]["integrity"],
+                size,
+                time.time(),
+                package_name,
+                version,
+            ),
+        )
+
+    def mark_uploaded(self, package_name, version, checksum):
+        self.write(
+            "UPDATE versions SET status = 'uploaded', checksum = ?, error = NULL,"
+            " updated_at = ? WHERE package = ? AND version = ?",
+            (checksum, time.time(), package_name, version),
+        )
+
+    def mark_failed(self, package_name, version, error):
+        self.write(
+            "UPDATE versions SET error = ?, updated_at = ? WHERE package = ? AND version = ?",
+            (str(error), time.time(), package_name, version),
+        )
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def order_download_jobs(adapter, download_jobs):
+    """
+    Sorts the versions of each package with the adapter's version_key and
+    interleaves the packages round-robin, so the downloads spread across
+    packages while each package's versions arrive in upload order.
+    """
+    jobs_by_package = {}
+    for job in download_jobs:
+        jobs_by_package.setdefault(job[0], []).append(job)
+    if adapter.version_key:
+        for jobs in jobs_by_package.values():
+            jobs.sort(key=lambda job: adapter.version_key(job[1]))
+    return [
+        job
+        for jobs in zip_longest(*jobs_by_package.values())
+        for job in jobs
+        if job is not None
+    ]
+
+
+def migrate_package_versions(adapter, download_jobs, state=None):
+    """
+    Downloads and uploads package versions as a pipeline. Downloads run in
+    parallel across all versions; the versions of a package are uploaded one
+    at a time in version order (different packages upload in parallel), and
+    the adapter finalizes each package once after its last version. At most
+    UPLOAD_QUEUE_SIZE versions are downloaded and waiting for upload, and
+    files are deleted after a confirmed upload (unless KEEP_DOWNLOADS).
+    Progress is recorded in the MigrationState, if given, and files an
+    earlier run downloaded are uploaded without downloading them again.
+    Returns (downloaded_packages, successful_uploads, failed_uploads).
+    """
+    download_jobs = order_download_jobs(adapter, download_jobs)
+    # Downloaded versions not uploaded yet; taken in job order, so every
+    # holder's predecessors in its package already hold one or are done
+    upload_slots = threading.BoundedSemaphore(UPLOAD_QUEUE_SIZE)
+    upload_queue = queue.Queue()  # Packages whose next version is ready
+    results_lock = threading.Lock()
+    downloaded_by_index = {}
+    successful_uploads = []
+    failed_uploads = []
+    packages = {}
+    for index, job in enumerate(download_jobs):
+        package = packages.setdefault(
+            job[0], {"indexes": [], "next": 0, "ready": {}, "uploading": False, "uploaded": 0}
+        )
+        package["indexes"].append(index)
+
+    def download_finished(package_name, index, package_info):
+        """Hands a downloaded (or failed, None) version to the package's upload sequence."""
+        with results_lock:
+            package = packages[package_name]
+            package["ready"][index] = package_info
+            if not package["uploading"] and package["indexes"][package["next"]] == index:
+                package["uploading"] = True
+                upload_queue.put(package_name)
+
+    def next_ready(package_name):
+        """
+        Returns the next downloaded version of a package in upload order, or
+        None (releasing the package) when it is not downloaded yet or done.
+        """
+        with results_lock:
+            package = packages[package_name]
+            while package["next"] < len(package["indexes"]):
+                index = package["indexes"][package["next"]]
+                if index not in package["ready"]:
+                    break
+                package["next"] += 1
+                package_info = package["ready"].pop(index)
+                if package_info is not None:
+                    return package_info
+            package["uploading"] = False
+            return None
+
+    def record_failure(package_name, version, error):
+        """Records a failed version in the state; a state error only gets printed."""
+        if not state:
+            return
+        try:
+            state.mark_failed(package_name, version, error)
+        except Exception as state_error:
+            print(
+                f"    Failed to record the failure of {adapter.display_name(package_name)}@{version}: {state_error}"
+            )
+
+    def download(index, job):
+        package_name, version, package_version_dir, metadata = job
+        display_name = adapter.display_name(package_name)
+        package_info = None
+        try:
+            files = state.downloaded_files(package_name, version) if state else None
+            if files is None:
+                files = adapter.fetch(package_name, version, metadata, package_version_dir)
+            if not files:
+                raise ValueError("no files were downloaded")
+            package_info = {
+                "package_name": package_name,
+                "version": version,
+                "files": files,
+                "download_dir": package_version_dir,
+                "size": sum(os.path.getsize(f["path"]) for f in files),
+            }
+            if state:
+                state.mark_downloaded(package_name, version, files, package_info["size"])
+            print(f"    ✓ Successfully downloaded {display_name}@{version}")
+            with results_lock:
+                downloaded_by_index[index] = package_info
+        except Exception as e:
+            # Continue to the next version/package even if one fails
+            package_info = None
+            print(f"    ✗ Failed to download {display_name}@{version}: {e}")
+            record_failure(package_name, version, e)
+        finally:
+            # The place in the package's upload sequence is always released, and
+            # the slot too unless the uploader takes it over with the version
+            if package_info is None:
+                upload_slots.release()
+            download_finished(package_name, index, package_info)
+
+    def upload(package_info):
+        package_name = package_info["package_name"]
+        version = package_info["version"]
+        display_name = adapter.display_name(package_name)
+        print(f"Uploading {display_name}@{version} to JFrog Artifactory ({adapter.repo})...")
+        try:
+            checksum = adapter.upload(package_name, version, package_info["files"])
+        except Exception as e:
+            with results_lock:
+                failed_uploads.append(
+                    {"package": f"{display_name}@{version}", "error": str(e)}
+                )
+            print(f"    Failed to upload {display_name}@{version}: {e}")
+            record_failure(package_name, version, e)
+            return False
+        print(f"      Successfully uploaded {display_name}@{version}.")
+        if state:
+            state.mark_uploaded(package_name, version, checksum)
+        with results_lock:
+            successful_uploads.append(f"{display_name}@{version}")
+        if not KEEP_DOWNLOADS:
+            for f in package_info["files"]:
+                if os.path.exists(f["path"]):
+                    os.remove(f["path"])
+        return True
+
+    def upload_worker():
+        while True:
+            package_name = upload_queue.get()
+            if package_name is None:
+                return
+            package = packages[package_name]
+            # Only this worker uploads the package until next_ready releases it
+            while True:
+                package_info = next_ready(package_name)
+                if package_info is None:
+                    break
+                try:
+                    if upload(package_info):
+                        package["uploaded"] += 1
+                except Exception as e:
+                    # Keeps the worker alive for the versions still queued
+                    print(
+                        f"    Failed to complete the upload of {adapter.display_name(package_name)}@{package_info['version']}: {e}"
+                    )
+                finally:
+                    upload_slots.release()
+            with results_lock:
+                done = package["next"] == len(package["indexes"]) and not package.get("finalized")
+                if done:
+                    package["finalized"] = True
+            if done and package["uploaded"]:
+                try:
+                    adapter.finalize_package(package_name)
+                except Exception as e:
+                    print(f"    Failed to finalize {adapter.display_name(package_name)}: {e}")
+
+    print(
+        f"\nMigrating {len(download_jobs)} versions of {len(packages)} packages with {MAX_WORKERS} download and {UPLOAD_WORKERS} upload workers..."
+    )
+    uploaders = [
+        threading.Thread(target=upload_worker, daemon=True)
+        for _ in range(UPLOAD_WORKERS)
+    ]
+    for uploader in uploaders:
+        uploader.start()
+
+    # Leaving the executor waits for every download; the slots pause the
+    # submissions while the uploaders are behind, which bounds the disk use
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for index, job in enumerate(download_jobs):
+            upload_slots.acquire()
+            executor.submit(download, index, job)
+
+    # Packages still queued are taken before the sentinels, and a worker keeps
+    # its package until the last handed-over version is uploaded
+    for _ in uploaders:
+        upload_queue.put(None)
+    for uploader in uploaders:
+        uploader.join()
+
+    if successful_uploads:
+        try:
+            adapter.finalize(successful_uploads)
+        except Exception as e:
+            print(f"Failed to finalize the migration to {adapter.repo}: {e}")
+
+    # Keep the upload order for the statistics
+    downloaded_packages = [
+        downloaded_by_index[index] for index in sorted(downloaded_by_index)
+    ]
+    return downloaded_packages, successful_uploads, failed_uploads
+
+
+def display_upload_summary(downloaded_packages, successful_uploads, failed_uploads):
+    """
+    Display the upload summary.
+    """
+    print("\n" + "=" * 80)
+    print("UPLOAD SUMMARY")
+    print("=" * 80)
+    print(f"Total packages processed: {len(downloaded_packages)}")
+    print(f"Successfully uploaded: {len(successful_uploads)}")
+    print(f"Failed uploads: {len(failed_uploads)}")
+
+    if successful_uploads:
+        print("\nSuccessfully uploaded packages:")
+        for pkg in successful_uploads:
+            print(f"  ✓ {pkg}")
+
+    if failed_uploads:
+        print("\nFailed uploads:")
+        for failure in failed_uploads:
+            print(f"  ✗ {failure['package']}: {failure['error']}")
+
+
+def display_download_statistics(downloaded_packages):
+    """
+    Display statistics and table of downloaded packages.
+    """
+    if not downloaded_packages:
+        print("No packages were downloaded.")
+        return
+
+    # Calculate statistics
+    packages_by_name = defaultdict(list)
+    for pkg in downloaded_packages:
+        packages_by_name[pkg["package_name"]].append(pkg)
+
+    total_packages = len(packages_by_name)
+    total_versions = len(downloaded_packages)
+
+    print("\n" + "=" * 80)
+    print("DOWNLOAD STATISTICS")
+    print("=" * 80)
+    print(f"Total unique packages: {total_packages}")
+    print(f"Total versions downloaded: {total_versions}")
+
+    # Package summary table
+    print("\nPackage Summary:")
+    summary_data = []
+    for package_name, versions in packages_by_name.items():
+        summary_data.append(
+            [package_name, len(versions), ", ".join([v["version"] for v in versions])]
+        )
+
+    print(
+        tabulate(
+            summary_data,
+            headers=["Package Name", "Versions Count", "Versions"],
+            tablefmt="grid",
+            maxcolwidths=[40, 15, 50],
+        )
+    )
+
+    # Detailed table of all downloaded versions, the sizes were recorded at
+    # download time since the files may be gone after their upload
+    print("\nDetailed Download List:")
+    detailed_data = []
+    for pkg in downloaded_packages:
+        files = pkg["files"]
+        detailed_data.append(
+            [
+                pkg["package_name"],
+                pkg["version"],
+                "\n".join(os.path.basename(f["path"]) for f in files),
+                f"{pkg['size'] / 1024:.1f} KB",
+                files[0]["checksums"]["sha1"],
+                pkg["download_dir"],
+            ]
+        )
+
+    print(
+        tabulate(
+            detailed_data,
+            headers=[
+                "Package Name",
+                "Version",
+                "Files",
+                "Size",
+                "SHA-1",
+                "Download Directory",
+            ],
+            tablefmt="grid",
+            maxcolwidths=[30, 15, 40, 15, 40, 40],
+            disable_numparse=True,
+        )
+    )
+
+
+def discover_download_jobs(adapter, output_dir):
+    """
+    Lists the organization's packages of the adapter's type and their
+    versions. Returns the download jobs (package_name, version, download_dir, metadata).
+    """
+    packages = adapter.filter_packages(get_packages_from_github(adapter.package_type))
+
+    if not packages:
+        print(
+            f"No {adapter.package_type} packages found in GitHub Packages for {GITHUB_ORG}."
+        )
+        return []
+
+    print(f"Found {len(packages)} {adapter.package_type} packages.")
+    print("\n" + "=" * 80)
+    print("DOWNLOADING PACKAGES FROM GITHUB")
+    print("=" * 80)
+
+    # Display all packages with count before downloading
+    print("\n" + "=" * 80)
+    print("ALL PACKAGES FOUND")
+    print("=" * 80)
+    for idx, pkg in enumerate(packages, 1):
+        print(f"{idx:3}. {pkg.get('name', '')}")
+    print(f"\nTotal packages found: {len(packages)}\n")
+    print("=" * 80)
+
+    # Phase 1: List the versions of every package concurrently
+    packages = [p for p in packages if p.get("name")]
+    download_jobs = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        version_futures = {
+            executor.submit(adapter.list_versions, package): package["name"]
+            for package in packages
+        }
+        versions_by_package = {}
+        started = time.time()
+        for done, future in enumerate(as_completed(version_futures), 1):
+            package_name = version_futures[future]
+            try:
+                versions_by_package[package_name] = future.result()
+            except Exception as e:
+                print(f"Failed to get versions for package {package_name}: {e}")
+            eta = github_rate_limiter.eta(started, done, len(version_futures))
+            print(
+                f"  [{done}/{len(version_futures)}] {github_rate_limiter.status()}, ETA {eta:.0f}s"
+            )
+
+    for package in packages:
+        package_name = package["name"]
+        versions = versions_by_package.get(package_name)
+        if versions is None:
+            continue
+        if not versions:
+            print(f"  No versions found for {package_name}. Skipping.")
+            continue
+        print(f"  Found {len(versions)} versions for {package_name}.")
+        for version, metadata in versions:
+            package_version_dir = os.path.join(
+                output_dir,
+                package_name.replace("/", "_").replace("@", ""),
+                version.replace(":", "_"),
+            )
+            download_jobs.append((package_name, version, package_version_dir, metadata))
+    return download_jobs
+
+
+def run_migration(adapter, resume=False, state_db=None):
+    """
+    Migrates every version of the organization's packages of the adapter's
+    type: discovery (or the saved state with resume), the target inventory,
+    the download/upload pipeline and the reports.
+    """
+    if not GITHUB_PAT:
+        print("Error: GITHUB_PAT environment variable not set.")
+        print("Please set your GitHub Personal Access Token with 'read:packages' scope.")
+        exit(1)
+    if not adapter.repo:
+        print(f"Error: no target repository set for {adapter.package_type} packages.")
+        exit(1)
+
+    state_db = state_db or f"{adapter.package_type}_migration_state.db"
+    downloaded_packages = []  # List to store all downloaded package info
+    state = MigrationState(state_db)
+
+    try:
+        output_dir = os.path.join(
+            os.getcwd(), f"{adapter.package_type}_packages_downloaded"
+        )
+        os.makedirs(output_dir, exist_ok=True)
+        print("=" * 80)
+        print(f"Using output directory: {output_dir}")
+
+        download_jobs = state.pending_jobs() if resume else None
+        if download_jobs is not None:
+            print(f"Resuming from {state_db}: {len(download_jobs)} versions left to migrate.")
+        else:
+            if resume:
+                print(f"No saved state in {state_db}, starting a new run.")
+            download_jobs = discover_download_jobs(adapter, output_dir)
+            if not download_jobs:
+                return
+            state.start_run(download_jobs)
+
+        # Drop the versions a previous run already migrated
+        if SKIP_EXISTING and download_jobs:
+            try:
+                migrated = get_migrated_versions(adapter)
+            except Exception as e:
+                print(f"Could not read the {adapter.repo} inventory, migrating all versions: {e}")
+                migrated = {}
+            pending_jobs = []
+            for job in download_jobs:
+                key = f"{job[0]}@{job[1]}"
+                if key in migrated:
+                    state.mark_uploaded(job[0], job[1], migrated[key])
+                else:
+                    pending_jobs.append(job)
+            print(
+                f"Skipping {len(download_jobs) - len(pending_jobs)} already migrated versions, {len(pending_jobs)} left to migrate."
+            )
+            download_jobs = pending_jobs
+
+        # Phase 2: Download and upload every version as a pipeline, each download in its own directory
+        downloaded_packages, successful_uploads, failed_uploads = (
+            migrate_package_versions(adapter, download_jobs, state)
+        )
+
+        # Phase 3: Display download statistics and the upload summary
+        display_download_statistics(downloaded_packages)
+        if downloaded_packages:
+            display_upload_summary(
+                downloaded_packages, successful_uploads, failed_uploads
+            )
+        else:
+            print("\nNo packages were downloaded, nothing was uploaded.")
+
+    except requests.exceptions.RequestException as e:
+        print(f"HTTP Request Error: {e}")
+    except subprocess.CalledProcessError as e:
+        print(f"Command execution failed: {e}")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+    finally:
+        state.close()
@@ -1,6 +1,5 @@
 # Version 0.9 - Nov 5 2024
 
-import requests
 import urllib3
 import sys
 import argparse
@@ -10,6 +9,10 @@ import os
 
 from tabulate import tabulate
 
+# The shared JFrog REST client lives at the root of the repository
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from jfrog_client import JFrogClient, profiling  # noqa: E402
+
 urllib3.disable_warnings()
 
 # Single lock for all file operations
@@ -89,6 +92,14 @@ class Artifactory:
             "Content-Type": "application/json",
         }
 
+        # Pooled, retrying client for every REST call to this instance
+        self.client = JFrogClient(
+            url,
+            token=auth[1],
+            headers={"Content-Type": "application/json"},
+            verify=False,
+        )
+
         # Get storage information of the Artifactory instance
         self.storage = self.storage()
 
@@ -105,7 +116,7 @@ class Artifactory:
         """Get list of repository keys"""
         url = self.url + "/artifactory/api/repositories"
         debug_request("GET", url, headers=self.headers, debug=self.debug)
-        repos = requests.get(url, headers=self.headers, verify=False)
+        repos = self.client.get(url)
         if repos.status_code != 200:
             print(f"Error getting repository list: {repos.status_code} - {repos.text}")
             return []
@@ -157,11 +168,7 @@ class Artifactory:
         ) = self.get_filtered_repo_configs()
 
     def get_repository_configurations(self):
-        repos = requests.get(
-            self.url + "/artifactory/api/repositories/configurations",
-            headers=self.headers,
-            verify=False,
-        )
+        repos = self.client.get("artifactory/api/repositories/configurations")
         return repos.json()
 
     def get_filtered_repo_configs(self):
@@ -201,7 +208,11 @@ class Artifactory:
         """Assign a repository to a project"""
         url = f"{self.url}/access/api/v1/projects/_/attach/repositories/{repo_name}/{project_key}?force=true"
         debug_request("PUT", url, headers=self.headers, debug=self.debug)
-        resp = requests.put(url, headers=self.headers, verify=False)
+        resp = self.client.put(
+            "access/api/v1/projects/_/attach/repositories/{repo}/{project}",
+            path_params={"repo": repo_name, "project": project_key},
+            params={"force": "true"},
+        )
         return resp.status_code == 204, resp
 
     def check_repo_exists(self, repo_name, package_type=None):
@@ -217,10 +228,8 @@ class Artifactory:
         if package_type == "docker":
             repo_name = repo_name.replace("_", "-").replace(".", "-")
 
-        resp = requests.get(
-            f"{self.url}/artifactory/api/repositories/{repo_name}",
-            headers=self.headers,
-            verify=False,
+        resp = self.client.get(
+            "artifactory/api/repositories/{repo}", path_params={"repo": repo_name}
         )
         return resp.status_code == 200
 
@@ -238,21 +247,16 @@ class Artifactory:
     def storage(self):
         url = self.url + "/artifactory/api/storageinfo"
         debug_request("GET", url, headers=self.headers, debug=self.debug)
-        storage = requests.get(url, headers=self.headers, verify=False)
+        storage = self.client.get(url)
         if storage.status_code != 200:
             print(f"Error getting storage info: {storage.status_code} - {storage.text}")
             return {}
         return storage.json()
 
     def refresh_storage_summary(self):
-        headers = {
-            "content-type": "application/json",
-        }
-        resp = requests.post(
-            self.url + "/artifactory/api/storageinfo/calculate",
-            headers=headers,
-            verify=False,
-        )
+        url = self.url + "/artifactory/api/storageinfo/calculate"
+        debug_request("POST", url, headers=self.headers, debug=self.debug)
+        resp = self.client.post(url)
         if resp.status_code != 202:
             print("Non-202 response:", resp.status_code)
             print(resp.text)
@@ -452,11 +456,10 @@ class ArtifactoryHelper:
                 ]
 
             # Create repository
-            resp = requests.put(
-                f"{self.rt2.url}/artifactory/api/repositories/{new_name}",
+            resp = self.rt2.client.put(
+                "artifactory/api/repositories/{repo}",
+                path_params={"repo": new_name},
                 json=repo,
-                headers=self.rt2.headers,
-                verify=False,
             )
             repo_exists_in_target = False
             if resp.status_code == 400:
@@ -584,10 +587,8 @@ class ArtifactoryHelper:
                 )
 
                 # Get the replication configuration from the source
-                resp = requests.get(
-                    replication_url,
-                    headers=self.rt1.headers,
-                    verify=False,
+                resp = self.rt1.client.get(
+                    replication_url, endpoint="artifactory/api/replications/{repo}"
                 )
 
                 source_replication_exists = False
@@ -657,11 +658,10 @@ class ArtifactoryHelper:
 
                     if not dry_run:
                         # Create push replication on source
-                        resp = requests.put(
-                            f"{self.rt1.url}/artifactory/api/replications/{old_name}",
+                        resp = self.rt1.client.put(
+                            "artifactory/api/replications/{repo}",
+                            path_params={"repo": old_name},
                             json=replication_config,
-                            headers=self.rt1.headers,
-                            verify=False,
                         )
                         if resp.status_code in range(200, 202):
                             success_msg = f"Successfully created push replication for {repo_type} repository: {new_name} (from {old_name})"
@@ -733,10 +733,9 @@ class ArtifactoryHelper:
                 f"{self.rt1.url}/artifactory/api/replication/execute/{old_name}"
             )
 
-            resp = requests.post(
+            resp = self.rt1.client.post(
                 trigger_replication_url,
-                headers=self.rt1.headers,
-                verify=False,
+                endpoint="artifactory/api/replication/execute/{repo}",
             )
 
             try:
@@ -833,16 +832,12 @@ class ArtifactoryHelper:
                 f"{self.rt1.url}/artifactory/api/replication/{old_name}"
             )
 
-            resp = requests.get(
-                replication_url,
-                headers=self.rt1.headers,
-                verify=False,
+            resp = self.rt1.client.get(
+                replication_url, endpoint="artifactory/api/replications/{repo}"
             )
 
-            replication_resp = requests.get(
-                replication_status_url,
-                headers=self.rt1.headers,
-                verify=False,
+            replication_resp = self.rt1.client.get(
+                replication_status_url, endpoint="artifactory/api/replication/{repo}"
             )
 
             if resp.status_code == 200:
@@ -954,6 +949,17 @@ def parse_args():
         help="Enable debug output including curl commands",
     )
 
+    # Add profiling arguments
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the latency of every endpoint at exit (also JFROG_PROFILE=1)",
+    )
+    parser.add_argument(
+        "--profile_json",
+        help="Also write the run profile to this JSON file (also JFROG_PROFILE_JSON)",
+    )
+
     return parser.parse_args()
 
 
@@ -964,6 +970,7 @@ def parse_args():
 
 def main():
     args = parse_args()
+    profiling.configure(args.profile, args.profile_json)
 
     # Create authentication tuples for each instance
     if args.source_token.startswith("Bearer "):